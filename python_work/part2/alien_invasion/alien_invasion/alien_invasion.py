@@ -1,44 +1,122 @@
+import argparse
+import copy
+import logging
+import math
+import os
+import random
 import sys
-from time import sleep
+import threading
+from time import perf_counter, sleep
 
 import pygame
 
 from settings import Settings
-from game_stats import GameStats
+from assets import assets
+from text_cache import text_cache
+from game_engine import GameEngine
 from scoreboard import Scoreboard
 from button import Button
-from ship import Ship
-from laser import Laser
-from alien import Alien
+from dirty_renderer import DirtyRenderer
+from game_state import GameState
+from profiler import FrameProfiler, StartupTrace, LatencyTracker
+from input_recording import InputRecorder, Recording
+from frame_recorder import FrameRecorder
+from starfield import Starfield
+from quality import QualityController
+from score_store import GAME_DIR
+from timestep import FixedTimestep
+from snapshot import take_snapshot, restore_snapshot
+
+# Keys a replay skips: quitting, and saving or loading the snapshot file,
+#  which would make the replay depend on what's on disk.
+REPLAY_SKIPPED_KEYS = (pygame.K_q, pygame.K_F5, pygame.K_F9)
 
 
 class AlienInvasion:
-    """Overall class to manage game assets and behavior."""
+    """Overall class to draw the game and handle the player's input."""
 
-    def __init__(self):
+    def __init__(self, settings=None, startup_trace=False):
         """Initialize the game, and create a game resources."""
-        pygame.init()
-        self.settings = Settings()
-
-        # This block is for windowed mode
-        self.screen = pygame.display.set_mode(
-            (self.settings.screen_width, self.settings.screen_height))
+        # Time each step up to the first frame if asked to.
+        self.startup = StartupTrace(startup_trace)
+
+        # Only start the parts of pygame the game uses; pygame.init() would
+        #  also start sound and joysticks.
+        pygame.display.init()
+        pygame.font.init()
+        self.startup.lap('pygame display and font')
+        self.settings = settings if settings else Settings()
+
+        if self.settings.scaled_rendering:
+            # Draw offscreen at the game's own size, and scale that up to
+            #  the window.
+            if self.settings.fullscreen:
+                self.window = pygame.display.set_mode((0, 0),
+                                                      pygame.FULLSCREEN)
+            else:
+                self.window = pygame.display.set_mode(
+                    (self.settings.window_width, self.settings.window_height))
+            self.screen = pygame.Surface(
+                (self.settings.screen_width,
+                 self.settings.screen_height)).convert()
+        else:
+            # This block is for windowed mode
+            self.screen = pygame.display.set_mode(
+                (self.settings.screen_width, self.settings.screen_height))
 
-        # This block is for full screen mode.
-        # self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        # self.settings.screen_width = self.screen.get_rect().width
-        # self.settings.screen_height = self.screen.get_rect().height
+            # This block is for full screen mode.
+            # self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+            # self.settings.screen_width = self.screen.get_rect().width
+            # self.settings.screen_height = self.screen.get_rect().height
+            self.window = self.screen
 
+        self.screen_rect = self.screen.get_rect()
         pygame.display.set_caption("Alien Invasion")
-
-        # Create an instance to store game statistics,
-        #  and create a scoreboard.
-        self.stats = GameStats(self)
+        self.startup.lap('window')
+
+        # The engine holds the game state and rules; this class draws it.
+        #  It's made after the display, so its images match the display.
+        self.engine = GameEngine(self.settings)
+        self.stats = self.engine.stats
+
+        # The engine that's drawn. When the simulation runs on its own
+        #  thread, this is a copy of the last state it published, so it
+        #  doesn't change halfway through drawing a frame.
+        self.view = self.engine
+        if self.settings.threaded_simulation:
+            view_settings = copy.copy(self.settings)
+            view_settings.score_file = None
+            self.view = GameEngine(view_settings)
+        self.sim_lock = threading.Lock()
+        self.tick_done = threading.Condition(self.sim_lock)
+        self.simulating = False
+        # An error raised on the simulation thread, to raise again here.
+        self.simulation_error = None
+        self.published = None
+        self.startup.lap('game engine')
+
+        # Time each phase of the frame if asked to from the environment.
+        #  The simulation thread's ticks aren't part of a frame, so they
+        #  aren't timed.
+        self.profiler = FrameProfiler(
+            os.environ.get('ALIEN_INVASION_PROFILE') == '1')
+        if not self.settings.threaded_simulation:
+            self.engine.profiler = self.profiler
+
+        # Measures input latency and how evenly the ticks run.
+        self.latency = LatencyTracker()
+        # The tick count when input was last handled.
+        self.input_ticks = -1
+
+        # Records the player's input when a recording is asked for.
+        self.recorder = None
+
+        # Saves every frame drawn when a capture is asked for.
+        self.frame_recorder = None
+
+        # Create a scoreboard.
         self.sb = Scoreboard(self)
-
-        self.ship = Ship(self)
-        self.lasers = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
+        self.startup.lap('scoreboard')
 
         # Make the Start game buttons.
         self.game_buttons = []
@@ -47,72 +125,289 @@ class AlienInvasion:
         # self.medium_button = Button(self, "Medium")
         # self.hard_button = Button(self, "Hard")
 
-        self._create_fleet()
         self._make_game_buttons()
+        self.startup.lap('buttons')
 
-    def _start_game(self):
-        # Reset the game statistics.
-        self.stats.reset_stats()
-        self.stats.game_active = True
+        # An optional background of falling stars.
+        self.starfield = None
+        if self.settings.starfield_stars:
+            self.starfield = Starfield(self, self.settings.starfield_stars,
+                                       self.settings.starfield_layers)
+            self.startup.lap('starfield')
 
-        # Get rid of any remaining aliens and lasers.
-        self.aliens.empty()
-        self.lasers.empty()
+        # Optionally redraw only the parts of the screen that change.
+        self.dirty_renderer = None
 
-        # Create a new fleet and center the ship.
-        self._create_fleet()
-        self.ship.center_ship()
+        # Lower the quality when frames take too long.
+        self.quality = QualityController(self.settings.quality_tiers,
+                                         self.settings.target_fps)
+        self._apply_quality()
+        self.startup.lap('quality')
+
+    def _start_game(self):
+        # Reset the game state at the chosen difficulty.
+        self.engine.start_game(self.difficulty)
 
         # Hide the mouse cursor.
         pygame.mouse.set_visible(False)
 
-        # Initialize game settings and game screen template.
-        self.settings.initialize_dynamic_settings(self.difficulty)
+        # Initialize the game screen template.
         self.sb.prep_images()
 
         # Flip the flag to show the play button after this game.
         self.stats.show_play = 1
 
-    def run_game(self):
-        """Start the main game loop."""
-        while True:
+    def run_game(self, max_frames=None):
+        """Start the main game loop, and stop after max_frames if given."""
+        if self.settings.threaded_simulation:
+            self._run_threaded(max_frames)
+            return
+
+        timestep = FixedTimestep(self.settings)
+        while max_frames is None or self.stats.frames < max_frames:
+            # Wait for the next frame, then catch the simulation up to now.
+            timestep.wait(self._frame_rate())
+            self._check_quality(timestep.clock.get_rawtime() / 1000)
+            self.profiler.start_frame()
             self._check_events()
+            self.profiler.lap('_check_events')
 
+            ticks, dropped = timestep.catch_up(self._tick,
+                                               self._catchup_ticks())
             if self.stats.game_active:
-                self.ship.update()
-                self._update_lasers()
-                self._update_aliens()
+                self.stats.dropped_ticks += dropped
+
+            self.stats.frames += 1
+            self.stats.ticks += ticks
+            self.stats.fps = timestep.clock.get_fps()
+            if self.starfield and self.stats.game_active:
+                self.starfield.update(ticks * timestep.tick_dt)
+
+            # Draw the objects part of the way to their next tick.
+            self._update_screen(timestep.alpha)
+            self._finish_frame(self.stats.ticks)
 
-            self._update_screen()
+    def _tick(self, dt):
+        """Advance the game by one tick of dt reference frames."""
+        self.latency.tick_started()
+        self.engine.update(dt)
+        self._check_game_over()
+
+    def _run_threaded(self, max_frames=None):
+        """
+        Run the simulation on its own thread, and draw the latest state it
+        has published on this one.
+        """
+        clock = pygame.time.Clock()
+        tick_time = 1 / self.settings.tick_rate
+        tick_dt = self.settings.reference_fps / self.settings.tick_rate
+
+        self._publish()
+        data, shown_ticks, published_at = self.published
+        restore_snapshot(self.view, data)
+        self.simulating = True
+        simulation = threading.Thread(target=self._simulate, daemon=True)
+        simulation.start()
+        try:
+            while max_frames is None or self.stats.frames < max_frames:
+                clock.tick(self._frame_rate())
+                self.profiler.start_frame()
+                # Input changes the game between the simulation's ticks.
+                with self.sim_lock:
+                    self._check_events()
+                    self._check_game_over()
+                    # Let the tick that takes in new input finish, so the
+                    #  input shows up on this frame instead of the next.
+                    self.tick_done.wait_for(
+                        lambda: self.stats.ticks > self.input_ticks,
+                        tick_time)
+                if self.simulation_error:
+                    raise self.simulation_error
+                self.profiler.lap('_check_events')
+
+                # Take the latest state in one go; the simulation swaps in a
+                #  new one after each tick, and never changes an old one.
+                render_start = perf_counter()
+                data, ticks, published_at = self.published
+                if ticks != shown_ticks:
+                    restore_snapshot(self.view, data)
+
+                self.stats.frames += 1
+                self.stats.fps = clock.get_fps()
+                if self.starfield and self.view.stats.game_active:
+                    self.starfield.update((ticks - shown_ticks) * tick_dt)
+                shown_ticks = ticks
+
+                # Draw the objects as far as they've got towards their next
+                #  tick since the state was published.
+                self._update_screen(
+                    min((perf_counter() - published_at) / tick_time, 1))
+                # Only drawing and showing the frame count towards the
+                #  quality tier, not waiting on the simulation.
+                self._check_quality(perf_counter() - render_start)
+                self._finish_frame(ticks)
+        finally:
+            self.simulating = False
+            simulation.join()
+
+    def _simulate(self):
+        """
+        Advance the game at the tick rate until told to stop. An error stops
+        the simulation, and is kept for the render loop to raise.
+        """
+        try:
+            self._simulate_ticks()
+        except Exception as error:
+            self.simulation_error = error
+
+    def _simulate_ticks(self):
+        """Run the simulation's ticks, on time, while it's running."""
+        tick_time = 1 / self.settings.tick_rate
+        tick_dt = self.settings.reference_fps / self.settings.tick_rate
+        next_tick = perf_counter()
+
+        while self.simulating:
+            now = perf_counter()
+            if now < next_tick:
+                sleep(next_tick - now)
+                continue
+
+            # Drop the ticks we couldn't catch up on, as the single thread
+            #  loop does.
+            behind = int((now - next_tick) / tick_time)
+            if behind >= self.settings.max_catchup_ticks:
+                if self.stats.game_active:
+                    self.stats.dropped_ticks += behind
+                next_tick += behind * tick_time
+
+            self.latency.tick_started()
+            with self.sim_lock:
+                self.engine.update(tick_dt)
+                self.stats.ticks += 1
+                self._publish()
+                self.tick_done.notify_all()
+            next_tick += tick_time
+
+    def _publish(self):
+        """Publish a snapshot of the game for the screen to show."""
+        # The tuple is swapped in whole, so the screen never sees half of
+        #  one tick and half of another.
+        self.published = (take_snapshot(self.engine), self.stats.ticks,
+                          perf_counter())
+
+    def _frame_rate(self):
+        """Return the frame rate to run at right now."""
+        if self.dirty_renderer and not self.stats.game_active:
+            return self.settings.idle_fps
+        return self.settings.fps
+
+    def _catchup_ticks(self):
+        """Return the most ticks to run in one frame."""
+        # Idle frames are longer, so they're allowed as many frames' worth
+        #  of ticks as normal ones. Otherwise the game over and respawn
+        #  timers would run slow at the menu.
+        return math.ceil(self.settings.max_catchup_ticks
+                         * self.settings.fps / self._frame_rate())
+
+    def _check_quality(self, seconds):
+        """Change the quality tier if frames take seconds of work."""
+        if self.settings.adaptive_quality and self.quality.update(seconds):
+            self._apply_quality()
+
+    def _finish_frame(self, ticks):
+        """
+        Note that a frame showing the first ticks ticks is on the screen,
+        and do the work that follows every frame.
+        """
+        self.latency.frame_shown(ticks)
+        if self.frame_recorder:
+            self.frame_recorder.capture()
+        self.profiler.end_frame()
+        if self.stats.frames == 1:
+            self._report_startup()
+        self._check_profile_overlay()
+
+    def _report_startup(self):
+        """Print how long each start-up step took, if it was traced."""
+        if self.startup.enabled:
+            self.startup.lap('first frame')
+            print("\n".join(self.startup.report_lines()))
 
     def _check_events(self):
         """Respond to key presses and mouse events."""
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                old_high_score = self.stats._get_high_score()
-                if old_high_score < self.stats.high_score:
-                    self.stats._export_high_score()
-                sys.exit(0)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                if self.stats.show_play:
-                    self._check_play_button(mouse_pos)
-                else:
-                    self._check_difficulty_button(mouse_pos)
-            elif event.type == pygame.KEYDOWN:
-                self._check_keydown_events(event)
-            elif event.type == pygame.KEYUP:
-                self._check_keyup_events(event)
+            if self.recorder:
+                self.recorder.record(self.stats.ticks, event)
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP,
+                              pygame.MOUSEBUTTONDOWN):
+                self.latency.input_handled(self.stats.ticks)
+                self.input_ticks = self.stats.ticks
+            self._check_event(event)
+
+    def _check_event(self, event):
+        """Respond to one key press or mouse event."""
+        if event.type == pygame.QUIT:
+            self._quit_game()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            mouse_pos = self._window_to_screen(event.pos)
+            if self.stats.show_play:
+                self._check_play_button(mouse_pos)
+            else:
+                self._check_difficulty_button(mouse_pos)
+        elif event.type == pygame.KEYDOWN:
+            self._check_keydown_events(event)
+        elif event.type == pygame.KEYUP:
+            self._check_keyup_events(event)
+
+    def _window_to_screen(self, pos):
+        """Turn a position in the window into one on the game's screen."""
+        if self.window is self.screen:
+            return pos
+        window_width, window_height = self.window.get_size()
+        return (pos[0] * self.screen_rect.width // window_width,
+                pos[1] * self.screen_rect.height // window_height)
+
+    def replay(self, recording):
+        """
+        Play back a recording of the player's input as fast as possible,
+        without drawing anything unless the frames are being captured.
+        """
+        random.seed(recording.seed)
+        self.settings.tick_rate = recording.tick_rate
+        tick_dt = self.settings.reference_fps / self.settings.tick_rate
+        ticks_per_frame = max(self.settings.tick_rate // self.settings.fps, 1)
+
+        events = recording.events_by_tick()
+        for tick in range(recording.ticks):
+            for event in events.get(tick, []):
+                if (event.type != pygame.KEYDOWN
+                        or event.key not in REPLAY_SKIPPED_KEYS):
+                    self._check_event(event)
+            self.engine.update(tick_dt)
+            self._check_game_over()
+            self.stats.ticks += 1
+
+            # Draw frames as often as the game would, and wait for each one
+            #  to be saved rather than dropping it.
+            if self.frame_recorder and tick % ticks_per_frame == 0:
+                self._update_screen()
+                self.frame_recorder.capture(block=True)
 
     def _make_game_buttons(self):
         for button in self.settings.button_text:
             new_button = Button(self, button)
             self.game_buttons.append(new_button)
 
+        # Spread the difficulty buttons out across the screen, once.
+        for button in range(1, len(self.settings.button_text)):
+            centerx = int((self.settings.screen_width / 2) - (
+                self.game_buttons[button].width * 1.5) * (2 - button))
+            self.game_buttons[button].rect.centerx = centerx
+
     def _check_play_button(self, mouse_pos):
         """Prompt for difficulty when the player clicks Play."""
         button_clicked = self.game_buttons[0].rect.collidepoint(mouse_pos)
-        if button_clicked and not self.stats.game_active:
+        if button_clicked and self.engine.state.name == GameState.MENU:
             # Prompt for game difficulty.
             self.stats.show_play = 0
             # self._check_difficulty_button(mouse_pos)
@@ -123,16 +418,17 @@ class AlienInvasion:
         medium_button_clicked = self.game_buttons[2].rect.collidepoint(
             mouse_pos)
         hard_button_clicked = self.game_buttons[3].rect.collidepoint(mouse_pos)
+        at_menu = self.engine.state.name == GameState.MENU
 
-        if easy_button_clicked and not self.stats.game_active:
+        if easy_button_clicked and at_menu:
             # Reset the game settings.
             self.difficulty = 'easy'
             self._start_game()
-        elif medium_button_clicked and not self.stats.game_active:
+        elif medium_button_clicked and at_menu:
             # Reset the game settings.
             self.difficulty = 'medium'
             self._start_game()
-        elif hard_button_clicked and not self.stats.game_active:
+        elif hard_button_clicked and at_menu:
             # Reset the game settings.
             self.difficulty = 'hard'
             self._start_game()
@@ -140,191 +436,217 @@ class AlienInvasion:
     def _check_keydown_events(self, event):
         """Respond to keypresses."""
         if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = True
+            self.engine.ship.moving_right = True
         elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = True
+            self.engine.ship.moving_left = True
         elif event.key == pygame.K_q:
-            old_high_score = self.stats._get_high_score()
-            if old_high_score < self.stats.high_score:
-                self.stats._export_high_score()
-            sys.exit(0)
+            self._quit_game()
         elif event.key == pygame.K_SPACE:
-            self._fire_laser()
+            self.engine.fire_laser()
         elif event.key == pygame.K_p:
+            self.difficulty = self.engine.difficulty
             self._start_game()
+        elif event.key == pygame.K_F3:
+            self.profiler.toggle()
+            self.sb.prep_profile([])
+        elif event.key == pygame.K_F5:
+            self._save_snapshot()
+        elif event.key == pygame.K_F9:
+            self._load_snapshot()
 
     def _check_keyup_events(self, event):
         """Respond to key releases."""
         if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = False
+            self.engine.ship.moving_right = False
         elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = False
-
-    def _fire_laser(self):
-        """Create a new laser and add it to the lasers group."""
-        if len(self.lasers) < self.settings.lasers_allowed:
-            new_laser = Laser(self)
-            self.lasers.add(new_laser)
-
-    def _update_lasers(self):
-        """Update position of lasers and get rid of old lasers."""
-        # Update laser postitions.
-        self.lasers.update()
-
-        # Get rid of lasers that have disappeared.
-        for laser in self.lasers.copy():
-            if laser.rect.bottom <= 0:
-                self.lasers.remove(laser)
-
-        self._check_laser_alien_collisions()
-
-    def _check_laser_alien_collisions(self):
-        """Respond to laser-alien collisions."""
-        # Remove any lasers and aliens that have collided.
-        collisions = pygame.sprite.groupcollide(
-            self.lasers, self.aliens,
-            self.settings.laser_collide_remove, True
-        )
-
-        if collisions:
-            for aliens in collisions.values():
-                self.stats.score += self.settings.alien_points * len(aliens)
-            self.sb.prep_score()
-            self.sb.check_high_score()
-
-        self._start_new_level()
-
-    def _start_new_level(self):
-        # Remove existing lasers and create a new fleet
-        if not self.aliens:
-            self.lasers.empty()
-            self._create_fleet()
-            self.settings.increase_speed()
-
-            # Increase level.
-            self.stats.level += 1
-            self.sb.prep_level()
-
-    def _create_fleet(self):
-        """Create the fleet of aliens."""
-        # Create an alien and determine the number of aliens in a row.
-        # Spacing between each alien is equal to one alien width.
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        available_space_x = self.settings.screen_width - (2 * alien_width)
-        number_aliens_x = available_space_x // (2 * alien_width)
-
-        # Determine the number of rows of aliens that fit on the screen.
-        ship_height = self.ship.rect.height
-        available_space_y = (self.settings.screen_height
-                             - (3 * alien_height) - ship_height)
-        number_rows = available_space_y // (2 * alien_height)
-
-        # Create the full fleet of aliens.
-        for row_number in range(number_rows):
-            for alien_number in range(number_aliens_x):
-                self._create_alien(alien_number, row_number)
-
-    def _create_alien(self, alien_number, row_number):
-        """Create an alien and place it in the row."""
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        alien.x = alien_width + 2 * alien_width * alien_number
-        alien.rect.x = alien.x
-        alien.rect.y = alien.rect.height + 2 * alien.rect.height * row_number
-        self.aliens.add(alien)
-
-    def _check_fleet_edges(self):
-        """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
-
-    def _check_aliens_bottom(self):
-        """Check if any aliens have reached the bottom of the screen."""
-        screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= screen_rect.bottom:
-                # Treat this the same as if the ship got hit.
-                self._ship_hit()
-                break
-
-    def _change_fleet_direction(self):
-        """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
-        self.settings.fleet_direction *= -1
-
-    def _update_aliens(self):
-        """
-        Check if the fleet is at an edge, then update the positions of all
-        aliens in the fleet.
-        """
-        self._check_fleet_edges()
-        self.aliens.update()
-
-        # Look for alien-ship collisions.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
-            self._ship_hit()
-
-        # Look for aliens hitting the bottom of the screen.
-        self._check_aliens_bottom()
-
-    def _ship_hit(self):
-        """Respond to the ship being hit by an alien."""
-        if self.stats.ships_left > 0:
-            # Decrement ships_left, and update scoreboard.
-            self.stats.ships_left -= 1
-            self.sb.prep_ships()
-
-            # Get rid of any remaining aliens and lasers.
-            self.aliens.empty()
-            self.lasers.empty()
-
-            # Create a new fleet and center the ship.
-            self._create_fleet()
-            self.ship.center_ship()
-
-            # Pause.
-            sleep(0.5)
-        else:
-            self.stats.game_active = False
-            pygame.mouse.set_visible(True)
+            self.engine.ship.moving_left = False
+
+    def _game_file(self, filename):
+        """Return the path to filename next to the game, like the scores."""
+        return os.path.join(GAME_DIR, filename)
+
+    def _save_snapshot(self):
+        """Save the game as it is now to the snapshot file."""
+        with open(self._game_file(self.settings.snapshot_file), 'wb') as f:
+            f.write(take_snapshot(self.engine))
+
+    def _load_snapshot(self):
+        """Put the game back the way it was when the snapshot was saved."""
+        try:
+            with open(self._game_file(self.settings.snapshot_file), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        restore_snapshot(self.engine, data)
+        pygame.mouse.set_visible(not self.stats.game_active)
+
+    def _quit_game(self):
+        """Save the score, the recording and the profiler trace, then quit."""
+        if self.stats.game_active:
+            self.stats.save_score(self.engine.difficulty)
+        self.stats.scores.close()
+        if self.recorder:
+            self.recorder.save(self.stats.ticks)
+        if self.frame_recorder:
+            self._close_frame_recorder()
+        self.profiler.write_trace(
+            self._game_file(self.settings.profile_trace))
+        if self.profiler.trace:
+            # Show how well the caches did alongside the profile.
+            print(assets.report())
+            print(text_cache.report())
+        sys.exit(0)
+
+    def _close_frame_recorder(self):
+        """Finish writing the captured frames, and say how many were kept."""
+        self.frame_recorder.close()
+        print(f"Captured {self.frame_recorder.written} of "
+              f"{self.frame_recorder.frames} frames to "
+              f"{self.frame_recorder.path}.")
+
+    def _apply_quality(self):
+        """Turn optional work on or off to match the quality tier."""
+        if self.starfield:
+            self.starfield.show(self.quality.get('starfield_share'))
+
+        dirty = (self.settings.dirty_rendering
+                 or self.quality.get('dirty_rendering'))
+        if dirty and not self.dirty_renderer:
+            self.dirty_renderer = DirtyRenderer(self)
+        elif not dirty:
+            self.dirty_renderer = None
+
+    def _check_profile_overlay(self):
+        """Refresh the performance overlay every few frames."""
+        if (self.profiler.enabled and self.stats.frames
+                % self.quality.get('overlay_frames') == 0):
+            lines = [f"{self.stats.fps:.0f} fps, "
+                     f"{self.stats.dropped_ticks} dropped ticks, "
+                     f"{self.quality.name} quality"]
+            lines.extend(self.profiler.report_lines())
+            lines.extend(self.latency.report_lines())
+            self.sb.prep_profile(lines)
+
+    def _check_game_over(self):
+        """Show the mouse again once the last ship is lost."""
+        if self.engine.ship_was_hit:
+            self.engine.ship_was_hit = False
+            if not self.stats.game_active:
+                pygame.mouse.set_visible(True)
 
     def _draw_buttons(self):
-        if self.stats.show_play:
+        if self.view.stats.show_play:
             self.game_buttons[0].draw_button()
         else:
             for button in range(1, len(self.settings.button_text)):
-                self.game_buttons[button].rect.centerx = int((
-                    self.settings.screen_width / 2) - (
-                    self.game_buttons[button].width * 1.5) * (2 - button))
-                self.game_buttons[button].msg_image_rect.centerx = int((
-                    self.settings.screen_width / 2) - (
-                    self.game_buttons[button].width * 1.5) * (2 - button))
                 self.game_buttons[button].draw_button()
 
-    def _update_screen(self):
+    def _draw_objects(self, alpha=1):
+        """Draw the lasers, ship and aliens, and return where they went."""
+        rects = self.view.lasers.draw(self.screen, alpha)
+        rects.append(self.view.ship.blitme(self.screen, alpha))
+        rects.append(self.view.aliens.draw(self.screen, alpha))
+        return rects
+
+    def _update_screen(self, alpha=1):
         """Update images on the screen and flip to the new screen."""
+        # alpha is how far the game is between the last tick and the next.
+        if self.dirty_renderer:
+            self.dirty_renderer.draw(alpha)
+            return
+
         self.screen.fill(self.settings.bg_color)
-        for laser in self.lasers.sprites():
-            laser.draw_laser()
-        self.ship.blitme()
-        self.aliens.draw(self.screen)
+        if self.starfield:
+            self.starfield.draw(self.screen)
+        self._draw_objects(alpha)
 
         # Draw the score information.
+        self.sb.check_stats()
         self.sb.show_score()
 
-        # Draw the play button if the game is inactive.
-        if not self.stats.game_active:
+        # Draw the play button if the game is at the menu.
+        if self.view.state.name == GameState.MENU:
             self._draw_buttons()
 
         # Everything needs to be drawn before .flip
-        pygame.display.flip()
+        self.profiler.lap('_update_screen')
+        self._show_frame()
+        self.profiler.lap('display.flip')
+
+    def _show_frame(self, rects=None):
+        """
+        Show what's been drawn, scaling it up to the window first if needed.
+        Only rects are updated, if given.
+        """
+        if self.window is not self.screen:
+            # The whole window changes when the frame is scaled.
+            size = self.window.get_size()
+            if (self.settings.scale_mode == 'smooth'
+                    and self.quality.get('smooth_scaling')):
+                pygame.transform.smoothscale(self.screen, size, self.window)
+            else:
+                pygame.transform.scale(self.screen, size, self.window)
+            pygame.display.flip()
+        elif rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
 
 
 if __name__ == '__main__':
-    # Make a game instance, and run the game.
-    ai = AlienInvasion()
-    ai.run_game()
+    parser = argparse.ArgumentParser(description="Play Alien Invasion.")
+    parser.add_argument('--record', metavar='FILE',
+                        help="record your input to FILE")
+    parser.add_argument('--seed', type=int,
+                        help="seed the random numbers of a recording")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="replay the input recorded in FILE as fast as "
+                             "possible, without a window")
+    parser.add_argument('--capture', metavar='PATH',
+                        help="save every frame to PATH, as a frame log if it "
+                             "ends in .frames or as PNG images in a folder")
+    parser.add_argument('--threaded', action='store_true',
+                        help="run the simulation on its own thread, apart "
+                             "from drawing, for steadier ticks; input takes "
+                             "longer to reach the screen")
+    parser.add_argument('--startup-trace', action='store_true',
+                        help="print how long each step of starting up takes, "
+                             "up to the first frame")
+    args = parser.parse_args()
+
+    if args.replay:
+        # Replays run without a window, and stay off the leaderboards.
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        settings = Settings()
+        settings.score_file = None
+        ai = AlienInvasion(settings)
+
+        if args.capture:
+            ai.frame_recorder = FrameRecorder(ai.screen, args.capture)
+
+        recording = Recording(args.replay)
+        start = perf_counter()
+        ai.replay(recording)
+        seconds = perf_counter() - start
+        if ai.frame_recorder:
+            ai._close_frame_recorder()
+        print(f"Replayed {recording.ticks} ticks in {seconds:.2f} s, "
+              f"{recording.ticks / recording.tick_rate / seconds:.0f} "
+              f"times real time.")
+        print(f"Level {ai.stats.level}, score {ai.stats.score}.")
+    else:
+        # Log changes to the quality tier as the game runs.
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s %(name)s: %(message)s')
+
+        # Make a game instance, and run the game.
+        settings = Settings()
+        if args.threaded:
+            settings.threaded_simulation = True
+        ai = AlienInvasion(settings, startup_trace=args.startup_trace)
+        if args.record:
+            ai.recorder = InputRecorder(args.record, args.seed,
+                                        ai.settings.tick_rate)
+        if args.capture:
+            ai.frame_recorder = FrameRecorder(ai.screen, args.capture)
+        ai.run_game()
@@ -0,0 +1,104 @@
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+
+class AssetCache:
+    """A class to load each game image once and share it between sprites."""
+
+    def __init__(self):
+        """Initialize an empty cache and its load statistics."""
+        self.images = {}
+        self.masks = {}
+        self.solid_sums = {}
+
+        # Statistics so we can confirm the game isn't reading from disk.
+        self.loads = 0
+        self.hits = 0
+        self.load_times = {}
+
+    def get_image(self, path, angle=0):
+        """
+        Return the Surface for path, rotated by angle degrees.
+
+        The file is only read and converted the first time it is asked for,
+        every later call hands back that same Surface.
+        """
+        key = (path, angle)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        if angle:
+            # Build rotated images from the cached original.
+            image = pygame.transform.rotate(self.get_image(path), angle)
+        else:
+            image = self._load(path)
+        self.images[key] = image
+        return image
+
+    def get_mask(self, path, angle=0):
+        """
+        Return a collision mask of the solid pixels in the image for path,
+        built the first time it's asked for.
+        """
+        key = (path, angle)
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.get_image(path, angle))
+            self.masks[key] = mask
+        return mask
+
+    def get_solid_sums(self, path, angle=0):
+        """
+        Return a summed-area table of the mask for path, built the first
+        time it's asked for. sums[x, y] counts the solid pixels above and to
+        the left of (x, y), so any box can be checked for solid pixels with
+        four lookups.
+        """
+        key = (path, angle)
+        sums = self.solid_sums.get(key)
+        if sums is None:
+            mask = self.get_mask(path, angle)
+            width, height = mask.get_size()
+            solid = np.array([[mask.get_at((x, y)) for y in range(height)]
+                              for x in range(width)])
+            sums = np.zeros((width + 1, height + 1), dtype=int)
+            sums[1:, 1:] = solid.cumsum(0).cumsum(1)
+            self.solid_sums[key] = sums
+        return sums
+
+    def _load(self, path):
+        """Read an image from disk and match it to the display format."""
+        start = perf_counter()
+        image = pygame.image.load(path)
+
+        # Converting needs a display, so headless runs keep the raw image.
+        if pygame.display.get_surface():
+            if image.get_flags() & pygame.SRCALPHA:
+                image = image.convert_alpha()
+            else:
+                image = image.convert()
+
+        self.loads += 1
+        self.load_times[path] = perf_counter() - start
+        return image
+
+    def clear(self):
+        """Forget every cached image, so the next request reloads it."""
+        self.images.clear()
+        self.masks.clear()
+        self.solid_sums.clear()
+
+    def report(self):
+        """Return a short summary of loads, cache hits and load times."""
+        lines = [f"Images loaded: {self.loads}, cache hits: {self.hits}"]
+        for path, seconds in self.load_times.items():
+            lines.append(f"  {path}: {seconds * 1000:.2f} ms")
+        return "\n".join(lines)
+
+
+# The one cache shared by every sprite in the game.
+assets = AssetCache()
@@ -0,0 +1,202 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import statistics
+from multiprocessing import Pool
+from time import perf_counter
+
+import numpy as np
+
+from settings import Settings
+from game_engine import GameEngine, chase_policy
+
+# The settings each worker process changes for every game it plays.
+worker_settings = None
+
+
+def random_policy(rng):
+    """Return a player that wanders and fires at random, driven by rng."""
+    def policy(engine):
+        ship = engine.ship
+        if rng.random() < 0.02:
+            ship.moving_right = rng.random() < 0.5
+            ship.moving_left = not ship.moving_right
+        if rng.random() < 0.1:
+            engine.fire_laser()
+    return policy
+
+
+def _start_worker():
+    """Make the settings this worker plays its games with."""
+    global worker_settings
+    worker_settings = Settings()
+
+    # Tuning games don't go on the leaderboards.
+    worker_settings.score_file = None
+
+
+def play_tuning_game(job):
+    """Play one headless game with the settings in job, and return results."""
+    settings = worker_settings
+    settings.difficulties[job['difficulty']] = job['speedup']
+    settings.score_scale = job['score_scale']
+    settings.fleet_drop_speed = job['drop_speed']
+
+    # Every game gets its own seed, so it plays out the same way no matter
+    #  which worker runs it.
+    random.seed(job['seed'])
+    rng = random.Random(job['seed'])
+    if job['policy'] == 'random':
+        policy = random_policy(rng)
+    else:
+        policy = chase_policy
+
+    # A new engine for each game, so nothing carries over from the last.
+    engine = GameEngine(settings)
+    engine.start_game(job['difficulty'])
+
+    # Note the tick and score each time a new level is reached.
+    dt = settings.reference_fps / settings.tick_rate
+    score_curve = [(0, 0)]
+    ticks = 0
+    while engine.stats.game_active and ticks < job['max_ticks']:
+        policy(engine)
+        engine.update(dt)
+        ticks += 1
+        if engine.stats.level > len(score_curve):
+            score_curve.append((ticks, engine.stats.score))
+
+    result = dict(job)
+    result.update(level=engine.stats.level, score=engine.stats.score,
+                  ticks=ticks, survival_time=ticks / settings.tick_rate,
+                  score_curve=score_curve)
+    return result
+
+
+def make_jobs(args):
+    """Return a job for every game to play, in a fixed order."""
+    settings = Settings()
+    configs = itertools.product(
+        args.difficulty, args.speedup or [None],
+        args.score_scale or [settings.score_scale],
+        args.drop_speed or [settings.fleet_drop_speed], args.policy)
+
+    jobs = []
+    for difficulty, speedup, score_scale, drop_speed, policy in configs:
+        if speedup is None:
+            speedup = settings.difficulties[difficulty]
+        for game in range(args.games):
+            jobs.append({
+                'difficulty': difficulty, 'speedup': speedup,
+                'score_scale': score_scale, 'drop_speed': drop_speed,
+                'policy': policy, 'game': game, 'max_ticks': args.max_ticks,
+            })
+
+    # Seeds come from one seed sequence, so a batch can be played again.
+    seeds = np.random.SeedSequence(args.seed).spawn(len(jobs))
+    for job, seed in zip(jobs, seeds):
+        job['seed'] = int(seed.generate_state(1)[0])
+    return jobs
+
+
+def summarize(results):
+    """Return a summary of the games played with each group of settings."""
+    groups = {}
+    for result in results:
+        key = (result['difficulty'], result['speedup'],
+               result['score_scale'], result['drop_speed'], result['policy'])
+        groups.setdefault(key, []).append(result)
+
+    summaries = []
+    for key, games in groups.items():
+        levels = [game['level'] for game in games]
+        scores = [game['score'] for game in games]
+        times = [game['survival_time'] for game in games]
+
+        # The average score on reaching each level, over the games that
+        #  got there.
+        curve = []
+        for level in range(max(levels)):
+            reached = [game['score_curve'][level] for game in games
+                       if len(game['score_curve']) > level]
+            curve.append(statistics.mean(score for tick, score in reached))
+
+        summaries.append({
+            'difficulty': key[0], 'speedup': key[1], 'score_scale': key[2],
+            'drop_speed': key[3], 'policy': key[4], 'games': len(games),
+            'mean_level': statistics.mean(levels), 'max_level': max(levels),
+            'mean_score': statistics.mean(scores),
+            'median_score': statistics.median(scores),
+            'mean_survival_time': statistics.mean(times),
+            'score_curve': curve,
+        })
+    return summaries
+
+
+def write_report(path, summaries, results):
+    """Write the report to path, as JSON if it ends in .json or as CSV."""
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump({'summaries': summaries, 'games': results}, f,
+                      indent=4)
+    else:
+        # The CSV report leaves out the score curves.
+        fields = [field for field in summaries[0] if field != 'score_curve']
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fields, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(summaries)
+
+
+def main():
+    """Play a batch of headless games and report how they went."""
+    settings = Settings()
+    parser = argparse.ArgumentParser(
+        description="Play many headless games to tune the difficulty.")
+    parser.add_argument('--games', type=int, default=10,
+                        help="games to play with each group of settings")
+    parser.add_argument('--difficulty', nargs='+',
+                        default=list(settings.difficulties),
+                        choices=list(settings.difficulties))
+    parser.add_argument('--speedup', type=float, nargs='+',
+                        help="speedup scales to try, in place of each "
+                             "difficulty's own")
+    parser.add_argument('--score-scale', type=float, nargs='+')
+    parser.add_argument('--drop-speed', type=float, nargs='+')
+    parser.add_argument('--policy', nargs='+', default=['chase'],
+                        choices=['chase', 'random'])
+    parser.add_argument('--max-ticks', type=int, default=100_000,
+                        help="longest game to play, in ticks")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--report', default='tuning_report.json',
+                        help="report file, JSON if it ends in .json, "
+                             "otherwise CSV")
+    args = parser.parse_args()
+
+    jobs = make_jobs(args)
+    start = perf_counter()
+    with Pool(args.workers, initializer=_start_worker) as pool:
+        results = pool.map(play_tuning_game, jobs, chunksize=4)
+    seconds = perf_counter() - start
+
+    summaries = summarize(results)
+    write_report(args.report, summaries, results)
+
+    ticks = sum(result['ticks'] for result in results)
+    print(f"Played {len(results)} games, {ticks:,} ticks in {seconds:.1f} s "
+          f"({ticks / seconds:,.0f} ticks/sec) on {args.workers} workers.")
+    for summary in summaries:
+        print(f"{summary['difficulty']:>6} x{summary['speedup']:<5} "
+              f"drop {summary['drop_speed']:<4g} "
+              f"{summary['policy']:>6}: level {summary['mean_level']:.1f}, "
+              f"score {summary['mean_score']:,.0f}, "
+              f"{summary['mean_survival_time']:.1f} s")
+    print(f"Report written to {args.report}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+from time import perf_counter
+
+import numpy as np
+
+
+class SortAndSweep:
+    """A broadphase that keeps objects sorted by the top of their rects."""
+
+    def __init__(self):
+        """Initialize an empty broadphase."""
+        self.build(np.zeros(0), 0)
+
+    def build(self, y, height):
+        """Sort objects of the given height by their tops y."""
+        self.height = height
+        self.order = np.argsort(y, kind='stable')
+        self.sorted_y = np.asarray(y)[self.order]
+
+    def query(self, top, bottom):
+        """Return the indices of objects whose rows overlap top to bottom."""
+        first = np.searchsorted(self.sorted_y, top - self.height, 'right')
+        last = np.searchsorted(self.sorted_y, bottom, 'left')
+        return self.order[first:last]
+
+    def query_many(self, tops, bottoms):
+        """
+        Run a query for each of tops and bottoms at once. Return the
+        query and object index of every overlapping pair.
+        """
+        first = np.searchsorted(self.sorted_y, tops - self.height, 'right')
+        last = np.searchsorted(self.sorted_y, bottoms, 'left')
+        counts = np.maximum(last - first, 0)
+
+        # Lay each query's run of sorted objects end to end.
+        queries = np.repeat(np.arange(counts.size), counts)
+        starts = np.repeat(first - np.cumsum(counts) + counts, counts)
+        return queries, self.order[starts + np.arange(queries.size)]
+
+
+def _brute_force(fleet, rect):
+    """Test rect against every live alien, with no broadphase."""
+    hits = (fleet.alive
+            & (fleet.x < rect.right) & (fleet.x + fleet.width > rect.left)
+            & (fleet.y < rect.bottom) & (fleet.y + fleet.height > rect.top))
+    return np.flatnonzero(hits)
+
+
+if __name__ == '__main__':
+    # Compare the broadphase with testing every laser against every alien.
+    import pygame
+
+    from game_engine import GameEngine
+
+    engine = GameEngine()
+    fleet = engine.aliens
+    for columns, rows in ((8, 6), (40, 25), (100, 50), (200, 100)):
+        fleet.create(columns, rows)
+
+        # Spread full width lasers down through the fleet.
+        lasers = [pygame.Rect(x, fleet.top + fleet.height * step,
+                              engine.settings.laser_width, 15)
+                  for step, x in enumerate(range(0, 1200, 150))]
+        candidates = sum(len(fleet.sweep.query(laser.top - fleet.offset_y,
+                                               laser.bottom - fleet.offset_y))
+                         for laser in lasers)
+
+        timings = {}
+        for name, collide in (
+                ('sweep', fleet.collide_rect),
+                ('brute force', lambda rect: _brute_force(fleet, rect))):
+            start = perf_counter()
+            for repeat in range(200):
+                for laser in lasers:
+                    collide(laser)
+            timings[name] = (perf_counter() - start) / 200
+
+        print(f"{len(fleet):6} aliens: "
+              f"{len(fleet) * len(lasers):7} pairs, "
+              f"{candidates:4} candidates, "
+              f"sweep {timings['sweep'] * 1e6:6.1f} us/tick, "
+              f"brute force {timings['brute force'] * 1e6:6.1f} us/tick")
@@ -1,6 +1,8 @@
-import pygame.font
+import pygame
 from pygame.sprite import Sprite
 
+from text_cache import text_cache
+
 
 class Button(Sprite):
     """This is a class for the play button."""
@@ -15,23 +17,27 @@ class Button(Sprite):
         self.width, self.height = 200, 50
         self.button_color = (0, 255, 0)
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
 
         # Build the button's rect object and center it.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
         self.rect.center = self.screen_rect.center
 
-        # The button message needs to be prepped only once.
-        self._prep_msg(msg)
+        # The button message is prepped once, the first time it's drawn.
+        self.msg = msg
+        self.msg_image = None
 
     def _prep_msg(self, msg):
         """Turn msg into a rendered image and center thext on the butotn."""
-        self.msg_image = self.font.render(msg, True, self.text_color,
-                                          self.button_color)
+        self.font = text_cache.get_font(48)
+        self.msg_image = text_cache.render(self.font, msg, self.text_color,
+                                           self.button_color)
         self.msg_image_rect = self.msg_image.get_rect()
         self.msg_image_rect.center = self.rect.center
 
     def draw_button(self):
+        if self.msg_image is None:
+            self._prep_msg(self.msg)
+
         # Draw blank button and then draw message.
         self.screen.fill(self.button_color, self.rect)
         self.screen.blit(self.msg_image, self.msg_image_rect)
@@ -0,0 +1,82 @@
+from game_state import GameState
+
+
+class DirtyRenderer:
+    """A class to redraw only the parts of the screen that changed."""
+
+    def __init__(self, ai_game):
+        """Initialize the renderer with an empty background."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.stats = ai_game.view.stats
+        self.state = ai_game.view.state
+        self.sb = ai_game.sb
+
+        # Everything that doesn't move is drawn once into the background.
+        self.background = self.screen.copy()
+        self.menu_state = None
+
+        # Where the moving objects were drawn on the last frame.
+        self.dirty_rects = []
+
+    def draw(self, alpha=1):
+        """Draw a frame, updating only the parts of the display that moved."""
+        self.sb.check_stats()
+        menu_state = (self.state.name, self.stats.show_play)
+        # Falling stars change the whole background, so it's redrawn every
+        #  frame while they're showing.
+        starfield = self.ai_game.starfield
+        stars_falling = (self.stats.game_active and starfield
+                         and starfield.showing())
+        if self.sb.changed or menu_state != self.menu_state or stars_falling:
+            self.sb.changed = False
+            self.menu_state = menu_state
+            self._draw_background(alpha)
+        elif self.stats.game_active:
+            self._draw_moving_objects(alpha)
+
+        # Between games nothing moves, so there's nothing to do.
+
+    def _draw_background(self, alpha):
+        """Build a new background and redraw the whole display."""
+        ai_game = self.ai_game
+        self.screen.fill(ai_game.settings.bg_color)
+        if ai_game.starfield:
+            ai_game.starfield.draw(self.screen)
+        if self.stats.game_active:
+            # Only the scoreboard stays still during play.
+            ai_game.sb.show_score()
+            self.background.blit(self.screen, (0, 0))
+            self.dirty_rects = self._draw_objects(alpha)
+        else:
+            # Nothing moves between games, so it's all background.
+            ai_game._draw_objects(alpha)
+            ai_game.sb.show_score()
+            if self.state.name == GameState.MENU:
+                ai_game._draw_buttons()
+            self.background.blit(self.screen, (0, 0))
+            self.dirty_rects = []
+
+        ai_game.profiler.lap('_update_screen')
+        ai_game._show_frame()
+        ai_game.profiler.lap('display.flip')
+
+    def _draw_moving_objects(self, alpha):
+        """Erase the objects from where they were, and draw them again."""
+        for rect in self.dirty_rects:
+            self.screen.blit(self.background, rect, rect)
+        rects = self._draw_objects(alpha)
+
+        # Update where the objects were and where they are now.
+        self.ai_game.profiler.lap('_update_screen')
+        self.ai_game._show_frame(self.dirty_rects + rects)
+        self.ai_game.profiler.lap('display.flip')
+        self.dirty_rects = rects
+
+    def _draw_objects(self, alpha):
+        """
+        Draw the moving objects, then the scoreboard wherever they cover it,
+        as a full redraw would. Return where anything was drawn.
+        """
+        rects = self.ai_game._draw_objects(alpha)
+        return rects + self.sb.show_score_over(rects)
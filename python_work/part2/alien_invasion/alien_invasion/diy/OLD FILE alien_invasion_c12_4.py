@@ -1,16 +1,31 @@
+import os
 import sys
-from random import randint
+from random import choice, randint
 
 import pygame
+from pygame.sprite import Sprite
+
+# Share modules such as the asset cache with the main game.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from settings_c12_4 import Settings
 from ship_c12_4 import Ship
 from friend_c12_4 import Friend
 from laser_c12_6 import Laser
-from star import Star
+from star import build_star_atlas
 from alien_c13_5 import Alien
 
 
+class Star(Sprite):
+    """A class for creating and storing stars in the sky."""
+
+    def __init__(self, ai_game):
+        """Initializes the star with a random image from the atlas."""
+        super().__init__()
+        self.image = choice(build_star_atlas())
+        self.rect = self.image.get_rect()
+
+
 class AlienInvasion:
     """Overall class to manage game assets and behavior."""
 
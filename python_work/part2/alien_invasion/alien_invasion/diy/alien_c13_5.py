@@ -1,6 +1,7 @@
-import pygame
 from pygame.sprite import Sprite
 
+from assets import assets
+
 
 class Alien(Sprite):
     """This is the Alien class for the DIY Alien Invasion."""
@@ -10,8 +11,7 @@ class Alien(Sprite):
         self.screen = ai_game.screen
         self.settings = ai_game.settings
 
-        self.image = pygame.image.load('images/alien.bmp')
-        self.image = pygame.transform.rotate(self.image, -90)
+        self.image = assets.get_image('images/alien.bmp', -90)
         self.rect = self.image.get_rect()
 
         # Start each alien at the top right of the screen
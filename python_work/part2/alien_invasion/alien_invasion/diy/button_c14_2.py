@@ -12,7 +12,7 @@ class Button:
         self.width, self.height = 200, 50
         self.btn_color = (50, 255, 10)
         self.msg_color = (205, 0, 245)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = pygame.font.Font(None, 48)
 
         self.rect = pygame.Rect(0, 0, self.width, self.height)
         self.rect.center = self.screen_rect.center
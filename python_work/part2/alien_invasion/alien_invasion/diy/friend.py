@@ -1,5 +1,4 @@
-import pygame
-
+from assets import assets
 from ship import Ship
 
 class Friend(Ship):
@@ -13,8 +12,8 @@ class Friend(Ship):
         # self.settings = ai_game.settings
         # self.screen_rect = ai_game.screen.get_rect()
 
-        # # Load the friendly ship image and get its rect.
-        self.image = pygame.image.load('images/friend.bmp')
+        # # Get the shared friendly ship image and its rect.
+        self.image = assets.get_image('images/friend.bmp')
         self.rect = self.image.get_rect()
 
         # Start each friendly ship at the middle left of the screen.
@@ -11,11 +11,21 @@ class Settings:
         self.screen_height = 800
         self.bg_color = (0, 0, 0)
 
+        # The scenes advance in fixed ticks, and are drawn at their own
+        #  rate. Speeds are in pixels per frame at reference_fps.
+        self.tick_rate = 120
+        self.fps = 60
+        self.reference_fps = 240
+        self.max_catchup_ticks = 5
+
         # Ship settings
         self.ship_speed = 1.5
         self.friend_speed = 1.5
         self.ship_limit = 3
 
+        # Seconds of game time to pause after losing a ship.
+        self.respawn_time = 0.5
+
         # Laser settings
         self.laser_width = 15
         self.laser_height = 3
@@ -30,6 +40,15 @@ class Settings:
         self.alien_direction = 1
         self.fleet_waves = 3
 
+        # Star settings
+        # Each star image is rotated once to every star_angle_step degrees.
+        self.stars_allowed = 100
+        self.star_angle_step = 15
+
+        # Tiny background stars, falling in layers behind the big ones.
+        self.starfield_stars = 20_000
+        self.starfield_layers = 3
+
         # Target settings
 
         self.target_direction = 1
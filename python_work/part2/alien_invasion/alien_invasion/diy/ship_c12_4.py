@@ -1,4 +1,4 @@
-import pygame
+from assets import assets
 
 
 class Ship:
@@ -10,8 +10,8 @@ class Ship:
         self.settings = ai_game.settings
         self.screen_rect = ai_game.screen.get_rect()
 
-        # Load the ship image and get its rect.
-        self.image = pygame.image.load('images/ship.bmp')
+        # Get the shared ship image and its rect.
+        self.image = assets.get_image('images/ship.bmp')
         self.rect = self.image.get_rect()
 
         # Start each new ship at the bottom center of the screen.
@@ -0,0 +1,91 @@
+import numpy as np
+import pygame
+
+from assets import assets
+from scene import Scene
+
+# The kinds of entity every ship scene has. Scenes number their own kinds
+#  from FIRST_SCENE_KIND.
+SHIP, FRIEND, LASER = range(3)
+FIRST_SCENE_KIND = 3
+
+
+class ShipScene(Scene):
+    """
+    A class for the DIY games, where the ship moves across the bottom and
+    the friend moves up and down the left side, firing lasers.
+    """
+
+    def __init__(self, settings, caption="Alien Invasion"):
+        """Place the ship and the friend, with the friend in control."""
+        super().__init__(settings, caption)
+        self.world.colors[LASER] = self.settings.laser_color
+
+        # Which of the ship's and friend's movement keys are held down.
+        self.moving = set()
+        self.friend_active = True
+
+        self.ship_image = self.world.add_image(
+            assets.get_image('images/ship.bmp'))
+        self.friend_image = self.world.add_image(
+            assets.get_image('images/friend.bmp'))
+        self._place_ships()
+
+    def _place_ships(self):
+        """Put the ship at the bottom center and the friend at the left."""
+        self.world.clear(SHIP)
+        self.world.clear(FRIEND)
+
+        rect = self.world.images[self.ship_image].get_rect(
+            midbottom=self.screen_rect.midbottom)
+        self.ship = self.world.spawn(SHIP, rect.x, rect.y, rect.width,
+                                     rect.height, image=self.ship_image)[0]
+        rect = self.world.images[self.friend_image].get_rect(
+            midleft=self.screen_rect.midleft)
+        self.friend = self.world.spawn(FRIEND, rect.x, rect.y, rect.width,
+                                       rect.height, image=self.friend_image)[0]
+
+    def key_down(self, key):
+        """Move the ships, fire, or switch between the ships."""
+        if key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):
+            self.moving.add(key)
+        elif key == pygame.K_SPACE:
+            self._fire_laser()
+        elif key == pygame.K_s:
+            self.friend_active = not self.friend_active
+
+    def key_up(self, key):
+        """Stop moving the ships."""
+        self.moving.discard(key)
+
+    def _fire_laser(self):
+        """Fire a laser from the friend, if the limit allows it."""
+        if len(self.world.find(LASER)) < self.settings.max_lasers:
+            world, friend = self.world, self.friend
+            x = world.x[friend] + world.width[friend]
+            y = (world.y[friend] + world.height[friend] // 2
+                 - self.settings.laser_height // 2)
+            world.spawn(LASER, x - self.settings.laser_width, y,
+                        self.settings.laser_width, self.settings.laser_height,
+                        vx=self.settings.laser_speed)
+
+    def steer(self, dt=1):
+        """The ship moves left and right, and the friend up and down."""
+        world = self.world
+        world.vx[self.ship] = world.vy[self.friend] = 0
+        if self.friend_active:
+            world.vy[self.friend] = self.settings.friend_speed * (
+                (pygame.K_DOWN in self.moving) - (pygame.K_UP in self.moving))
+        else:
+            world.vx[self.ship] = self.settings.ship_speed * (
+                (pygame.K_RIGHT in self.moving)
+                - (pygame.K_LEFT in self.moving))
+
+    def update(self, dt=1):
+        """Keep both ships on the screen."""
+        world = self.world
+        ships = np.array([self.ship, self.friend])
+        world.x[ships] = np.clip(world.x[ships], 0,
+                                 self.screen_rect.width - world.width[ships])
+        world.y[ships] = np.clip(world.y[ships], 0,
+                                 self.screen_rect.height - world.height[ships])
@@ -1,262 +1,159 @@
+import os
 import sys
-from random import randint
-from time import sleep
+from random import choice
 
-import pygame
+import numpy as np
+
+# Share modules such as the asset cache with the main game.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from settings_c12_4 import Settings
 from game_stats_13_6 import GameStats
-from ship_c12_4 import Ship
-from friend_c12_4 import Friend
-from laser_c12_6 import Laser
-from star import Star
-from alien_c13_5 import Alien
-
+from ship_scene import ShipScene, SHIP, FRIEND, LASER, FIRST_SCENE_KIND
+from star import build_star_atlas
+from starfield import Starfield
+from assets import assets
+from ecs import collide, cull
+from game_state import GameState
 
-class AlienInvasion:
-    """Overall class to manage game assets and behavior."""
+STAR, ALIEN = range(FIRST_SCENE_KIND, FIRST_SCENE_KIND + 2)
 
-    def __init__(self):
-        """Initialize the game, and create a game resources."""
-        pygame.init()
-        self.settings = Settings()
 
-        # This block is for windowed mode
-        self.screen = pygame.display.set_mode(
-            (self.settings.screen_width, self.settings.screen_height))
+class StarFall(ShipScene):
+    """Stars fall past the friend while it shoots down waves of aliens."""
 
-        # This block is for full screen mode.
-        # self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        # self.settings.screen_width = self.screen.get_rect().width
-        # self.settings.screen_height = self.screen.get_rect().height
+    draw_order = [STAR, ALIEN, LASER, SHIP, FRIEND]
 
-        pygame.display.set_caption("Alien Invasion")
+    def __init__(self):
+        """Initialize the game, and create a game resources."""
+        super().__init__(Settings())
 
         self.stats = GameStats(self)
-
-        self.ship = Ship(self)
-        self.friend = Friend(self)
-        self.lasers = pygame.sprite.Group()
-        self.stars = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
-
-        self._create_field()
+        self.state = GameState()
+        # There's no Play button, so the game starts right away.
+        self.stats.game_active = True
+        self.state.set(GameState.PLAYING)
+
+        # Rotate the star images once, so new stars only pick one.
+        self.star_images = [self.world.add_image(image) for image
+                            in build_star_atlas(self.settings.star_angle_step)]
+        self.starfield = Starfield(self, self.settings.starfield_stars,
+                                   self.settings.starfield_layers)
+
+        self.alien_image = self.world.add_image(
+            assets.get_image('images/alien.bmp', -90))
         self._create_fleet()
 
-    def run_game(self):
-        """Start the main game loop."""
-        while True:
-            self._check_events()
-
-            if self.stats.game_active:
-                self._update_stars()
-                self.ship.update()
-                self.friend.update()
-                self._update_lasers()
-                self._update_aliens()
-
-            self._update_screen()
-
-    def _check_events(self):
-        """Respond to key presses and mouse events."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit(0)
-
-            elif event.type == pygame.KEYDOWN:
-                self._check_keydown_events(event)
-            elif event.type == pygame.KEYUP:
-                self._check_keyup_events(event)
-
-    def _check_keydown_events(self, event):
-        """Respond to keypresses."""
-        if event.key == pygame.K_q:
-            sys.exit(0)
-        elif event.key == pygame.K_RIGHT:
-            self.ship.moving_right = True
-            # self.friend.moving_right = True
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = True
-            # self.friend.moving_left = True
-        elif event.key == pygame.K_UP:
-            # self.ship.moving_up = True
-            self.friend.moving_up = True
-        elif event.key == pygame.K_DOWN:
-            # self.ship.moving_down = True
-            self.friend.moving_down = True
-        elif event.key == pygame.K_SPACE:
-            self._fire_laser()
-        elif event.key == pygame.K_s:
-            if self.ship.active == True:
-                self.ship.active = False
-                self.friend.active = True
-            elif self.ship.active == False:
-                self.ship.active = True
-                self.friend.active = False
-
-    def _check_keyup_events(self, event):
-        """Respond to key releases."""
-        if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = False
-            # self.friend.moving_right = False
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = False
-            # self.friend.moving_left = False
-        elif event.key == pygame.K_UP:  # 12.4
-            #            self.ship.moving_up = False #12.4
-            self.friend.moving_up = False
-        elif event.key == pygame.K_DOWN:  # 12.4
-            #            self.ship.moving_down = False
-            self.friend.moving_down = False
-
-    def _fire_laser(self):
-        """Create a new laser and add it to the lasers group."""
-        if len(self.lasers) < self.settings.max_lasers:
-            new_laser = Laser(self)
-            self.lasers.add(new_laser)
-
-    def _update_lasers(self):
-        """Update position of the beam and remove old lasers."""
-        # Update laser position
-        self.lasers.update()
-
-        # Get rid of lasers off screen.
-        for laser in self.lasers.copy():
-            if laser.rect.left >= self.settings.screen_width:
-                self.lasers.remove(laser)
-
+    def tick(self, dt=1):
+        """Advance the game, unless it's over or waiting to respawn."""
+        # Count down any pause, without stopping the window.
+        self.state.update(dt / self.settings.reference_fps)
+        if (self.stats.game_active
+                and self.state.name != GameState.RESPAWNING):
+            super().tick(dt)
+
+    def update(self, dt=1):
+        """Recycle the stars, and let the friend and aliens fight."""
+        super().update(dt)
+        self.starfield.update(dt)
+        self._update_stars()
+        cull(self.world, self.screen_rect, LASER)
+        self._check_fleet_edges()
         self._check_laser_alien_collisions()
-
-    def _check_laser_alien_collisions(self):
-        collisions = pygame.sprite.groupcollide(self.lasers, self.aliens,
-                                                True, True)
-
-        if not self.aliens and self.stats.fleets_left > 0:
-            self.lasers.empty()
-            self.stats.fleets_left -= 1
-            self._create_fleet()
-
-        elif self.stats.fleets_left == 0:
-            self.stats.game_active = False
-
-    def _create_field(self):
-        """Create a field of stars."""
-        # Create a star and determine the number of stars in the row.
-        # Spacing between each star is equal to one star width.
-        star = Star(self)
-        star_width, star_height = star.rect.size
-        self.available_space_x = int((
-            self.settings.screen_width - (.5 * star_width)))
-        self.number_stars_x = self.available_space_x // star_width
-
-        # Determine the number of rows of aliens that fit on the screen.
-        # ship_height = self.ship.rect.height
-        available_space_y = self.settings.screen_height
-        number_rows = available_space_y // (2 * star_height)
-
-        # Create the full field of stars
-        # for row_number in range(number_rows):
-        #     for star_number in range(number_stars_x):
-        #         self._create_star(star_number, row_number)
-
-    def _create_star(self, star_number=0, row_number=0):
-        """Create a star and place it in the row."""
-        if len(self.stars) < 100:
-            star = Star(self)
-            star_width, star_height = star.rect.size
-            # star.x = star_width + 2 * star_width * star_number
-            star.x = randint(0, self.available_space_x)
-            star.rect.x = star.x + randint(-15, 15)
-            star.rect.y = ((star.rect.height + 2 * star.rect.height *
-                            row_number) + randint(-15, 15))
-            self.stars.add(star)
-
-    def _remove_star(self):
-        for star in self.stars.copy():
-            if star.rect.top >= self.settings.screen_height:
-                self.stars.remove(star)
+        self._check_friend_collisions()
 
     def _update_stars(self):
-        """Update the location of the stars on the screen."""
-        self._create_star()
-        self._remove_star()
-        self.stars.update()
+        """Add a star while there's room, and send fallen stars back up."""
+        world = self.world
+        if len(world.find(STAR)) < self.settings.stars_allowed:
+            self._reset_stars(world.spawn(STAR, 0, 0, 0, 0))
+        stars = world.find(STAR)
+        fallen = stars[world.y[stars] >= self.screen_rect.bottom]
+        if fallen.size:
+            self._reset_stars(fallen)
+
+    def _reset_stars(self, stars):
+        """
+        Give stars a new image and speed, and place them at random spots
+        along the top row.
+        """
+        world = self.world
+        world.image[stars] = [choice(self.star_images) for star in stars]
+        for star in stars.tolist():
+            world.width[star], world.height[star] = (
+                world.images[world.image[star]].get_size())
+        world.vy[stars] = np.random.randint(1, 101, stars.size) * .01
+
+        space_x = (self.settings.screen_width
+                   - world.width[stars] // 2).astype(int)
+        world.x[stars] = (np.random.randint(0, space_x + 1)
+                          + np.random.randint(-15, 16, stars.size))
+        world.y[stars] = (world.height[stars]
+                          + np.random.randint(-15, 16, stars.size))
 
     def _create_fleet(self):
-
-        alien = Alien(self)
-        available_space_y, available_space_x = self._calculate_fleet()
-
-        for alien_number in range(available_space_y):
-            for row_number in range(available_space_x):
-                self._create_alien(alien_number, row_number)
-
-    def _calculate_fleet(self):
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        # return available_space_y, available_space_x
-        return ((self.settings.screen_height // (alien_height * 2)),
-                (self.settings.screen_width // (alien_height * 2)) - 3)
-
-    def _create_alien(self, alien_number, alien_row):
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        alien.y = (alien_number * alien_height * 2) + 5
-        alien.x = self.settings.screen_width - (
-            (alien_row + 1) * alien_width * 2)
-        alien.rect.y = alien.y
-        alien.rect.x = alien.x
-        self.aliens.add(alien)
+        """Fill the right side of the screen with columns of aliens."""
+        width, height = self.world.images[self.alien_image].get_size()
+        rows = self.settings.screen_height // (height * 2)
+        columns = self.settings.screen_width // (height * 2) - 3
+        row, column = np.divmod(np.arange(rows * columns), columns)
+        self.world.spawn(
+            ALIEN, self.settings.screen_width - (column + 1) * width * 2,
+            row * height * 2 + 5, width, height,
+            vy=self.settings.alien_speed * self.settings.alien_direction,
+            image=self.alien_image)
 
     def _check_fleet_edges(self):
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._fleet_change_direction()
-                break
-
-    def _check_fleet_bottom(self):
-        # self.screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            if alien.rect.left <= 0:
-                self._ship_collide()
-
-    def _ship_collide(self):
-        if pygame.sprite.spritecollideany(self.friend, self.aliens):
-            if self.stats.ships_left > 0:
-                self.aliens.empty()
-                self.lasers.empty()
+        """Turn the fleet around and move it closer when it hits an edge."""
+        world = self.world
+        aliens = world.find(ALIEN)
+        if aliens.size and (
+                (world.y[aliens] + world.height[aliens]
+                 >= self.screen_rect.bottom).any()
+                or (world.y[aliens] <= 0).any()):
+            world.x[aliens] -= self.settings.alien_advance
+            self.settings.alien_direction *= -1
+            world.vy[aliens] = (self.settings.alien_speed
+                                * self.settings.alien_direction)
 
+    def _check_laser_alien_collisions(self):
+        """Remove lasers and aliens that hit each other."""
+        lasers, aliens = collide(self.world, LASER, ALIEN)
+        if lasers.size:
+            self.world.kill(np.concatenate((lasers, aliens)))
+
+        if not self.world.find(ALIEN).size:
+            if self.stats.fleets_left > 0:
+                self.world.clear(LASER)
+                self.stats.fleets_left -= 1
                 self._create_fleet()
-                self.ship.center_ship()
-                self.stats.ships_left -= 1
-
-                sleep(0.5)
             else:
                 self.stats.game_active = False
 
-    def _fleet_change_direction(self):
-        for alien in self.aliens.sprites():
-            alien.rect.x -= self.settings.alien_advance
-        self.settings.alien_direction *= -1
+    def _check_friend_collisions(self):
+        """Lose a ship when an alien reaches the friend."""
+        friends, aliens = collide(self.world, FRIEND, ALIEN)
+        if not friends.size:
+            return
+        if self.stats.ships_left > 0:
+            self.world.clear(ALIEN)
+            self.world.clear(LASER)
+            self._create_fleet()
+            self._place_ships()
+            self.stats.ships_left -= 1
 
-    def _update_aliens(self):
-        self._check_fleet_edges()
-        self.aliens.update()
-        self._ship_collide()
+            # Pause before the new fleet starts moving.
+            self.state.set(GameState.RESPAWNING, self.settings.respawn_time,
+                           GameState.PLAYING)
+        else:
+            self.stats.game_active = False
 
-    def _update_screen(self):
-        """Update images on the screen and flip to the new screen."""
-        self.screen.fill(self.settings.bg_color)
-        self.stars.draw(self.screen)
-        self.aliens.draw(self.screen)
-        for laser in self.lasers.sprites():
-            laser.draw_laser()
-        self.ship.blitme()
-        self.friend.blitme()
-        pygame.display.flip()
+    def draw_background(self):
+        """Draw the starfield behind the stars, aliens and ships."""
+        super().draw_background()
+        self.starfield.draw(self.screen)
 
 
 if __name__ == '__main__':
     # Make a game instance, and run the game.
-    ai = AlienInvasion()
-    ai.run_game()
+    StarFall().run()
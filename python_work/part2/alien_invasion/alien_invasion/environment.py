@@ -0,0 +1,272 @@
+import copy
+from multiprocessing import Pipe, Process
+from time import perf_counter
+
+import numpy as np
+
+from settings import Settings
+from game_engine import GameEngine
+
+# What each action does: (move left, move right, fire).
+ACTIONS = (
+    (False, False, False),
+    (True, False, False),
+    (False, True, False),
+    (False, False, True),
+    (True, False, True),
+    (False, True, True),
+)
+
+# How bright each kind of object is in a screen observation.
+ALIEN_SHADE, SHIP_SHADE, LASER_SHADE = 255, 170, 85
+
+
+class AlienInvasionEnv:
+    """
+    A class to let an automated player play the game one step at a time,
+    in the style of a Gym environment.
+    """
+
+    def __init__(self, settings=None, difficulty='medium',
+                 observation='features', frame_skip=1, max_steps=10_000,
+                 downsample=8):
+        """
+        Make a headless game to play at difficulty. Each step plays
+        frame_skip ticks. observation is 'features' for a short vector
+        built from the fleet arrays, or 'screen' for a picture of the
+        screen downsample times smaller each way.
+        """
+        if settings is None:
+            # Automated games don't go on the leaderboards.
+            settings = Settings()
+            settings.score_file = None
+        else:
+            # The game changes its settings as it plays, so games made with
+            #  the same settings each get their own copy.
+            settings = copy.deepcopy(settings)
+        self.settings = settings
+        self.engine = GameEngine(settings)
+        self.difficulty = difficulty
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.downsample = downsample
+        self.dt = settings.reference_fps / settings.tick_rate
+        self.steps = 0
+
+    def reset(self):
+        """Start a new game, and return the first observation."""
+        self.engine.start_game(self.difficulty)
+        self.steps = 0
+        return self.observe()
+
+    def step(self, action):
+        """
+        Take one of ACTIONS, and play on for frame_skip ticks. Return the
+        observation, the points scored, whether the game is done, and a
+        dict of extra information.
+        """
+        engine = self.engine
+        ship, stats = engine.ship, engine.stats
+        ship.moving_left, ship.moving_right, fire = ACTIONS[action]
+        if fire:
+            engine.fire_laser()
+
+        score, ships_left = stats.score, stats.ships_left
+        for tick in range(self.frame_skip):
+            engine.update(self.dt)
+            if not stats.game_active:
+                break
+        self.steps += 1
+
+        # A game that runs too long is cut short.
+        truncated = stats.game_active and self.steps >= self.max_steps
+        done = not stats.game_active or truncated
+        info = {'level': stats.level, 'ships_left': stats.ships_left,
+                'ship_lost': (stats.ships_left < ships_left
+                              or not stats.game_active),
+                'truncated': truncated}
+        return self.observe(), stats.score - score, done, info
+
+    def observe(self):
+        """Return what the player can see of the game right now."""
+        if self.observation == 'screen':
+            return self._observe_screen()
+        return self._observe_features()
+
+    def _observe_features(self):
+        """
+        Return the ship, fleet and lasers as numbers between about -1 and
+        1, followed by whether each alien in the fleet is still alive.
+        """
+        engine = self.engine
+        width = self.settings.screen_width
+        height = self.settings.screen_height
+        fleet, ship = engine.aliens, engine.ship
+
+        lowest = fleet.lowest_alien()
+        if lowest is None:
+            lowest_x = lowest_y = 0.0
+        else:
+            lowest_x = (fleet.x[lowest] + fleet.width / 2) / width
+            lowest_y = (fleet.y[lowest] + fleet.height) / height
+
+        features = np.empty(11 + fleet.alive.size, dtype=np.float32)
+        features[:11] = (
+            ship.rect.centerx / width, self.settings.fleet_direction,
+            fleet.left / width, fleet.right / width, fleet.top / height,
+            fleet.bottom / height, len(fleet) / max(fleet.alive.size, 1),
+            lowest_x, lowest_y,
+            len(engine.lasers) / self.settings.lasers_allowed,
+            engine.stats.ships_left / self.settings.ship_limit)
+        features[11:] = fleet.alive
+        return features
+
+    def _observe_screen(self):
+        """Return a small grayscale picture of the aliens, ship and lasers."""
+        scale = self.downsample
+        screen = np.zeros((self.settings.screen_height // scale,
+                           self.settings.screen_width // scale),
+                          dtype=np.uint8)
+        engine = self.engine
+        fleet, lasers = engine.aliens, engine.lasers
+
+        def fill(x, y, width, height, shade):
+            # Rects are clipped to the picture by the slices.
+            for left, top in zip((x // scale).astype(int).tolist(),
+                                 (y // scale).astype(int).tolist()):
+                screen[max(top, 0):max(top + height, 0),
+                       max(left, 0):max(left + width, 0)] = shade
+
+        alive = fleet.alive
+        fill(fleet.x[alive], fleet.y[alive], -(-fleet.width // scale),
+             -(-fleet.height // scale), ALIEN_SHADE)
+        active = np.flatnonzero(lasers.active[:lasers.top])
+        fill(lasers.x[active], lasers.y[active], -(-lasers.width // scale),
+             -(-lasers.height // scale), LASER_SHADE)
+        rect = engine.ship.rect
+        fill(np.array([rect.x]), np.array([rect.y]),
+             -(-rect.width // scale), -(-rect.height // scale), SHIP_SHADE)
+        return screen
+
+
+class VectorEnv:
+    """
+    A class to step many games in lockstep, in this process or spread over
+    worker processes. A game that ends is reset right away.
+    """
+
+    def __init__(self, num_envs, workers=0, **env_options):
+        """
+        Make num_envs games with env_options. With workers, the games are
+        shared out between that many worker processes.
+        """
+        self.num_envs = num_envs
+        self.workers = []
+        if not workers:
+            self.envs = [AlienInvasionEnv(**env_options)
+                         for env in range(num_envs)]
+            return
+
+        # Deal the games out as evenly as possible.
+        self.envs = None
+        counts = [len(range(worker, num_envs, workers))
+                  for worker in range(workers)]
+        self.splits = np.cumsum(counts)[:-1]
+        for count in counts:
+            connection, worker_connection = Pipe()
+            process = Process(target=_env_worker,
+                              args=(worker_connection, count, env_options),
+                              daemon=True)
+            process.start()
+            self.workers.append((connection, process))
+
+    def reset(self):
+        """Start every game again, and return their observations."""
+        if self.envs is not None:
+            return np.stack([env.reset() for env in self.envs])
+        for connection, process in self.workers:
+            connection.send(('reset', None))
+        return np.concatenate([connection.recv()
+                               for connection, process in self.workers])
+
+    def step(self, actions):
+        """
+        Take one action in each game. Return arrays of observations,
+        rewards and dones, and a list of info dicts.
+        """
+        if self.envs is not None:
+            return _step_envs(self.envs, actions)
+        for (connection, process), chunk in zip(
+                self.workers, np.split(np.asarray(actions), self.splits)):
+            connection.send(('step', chunk))
+        results = [connection.recv() for connection, process in self.workers]
+        return (np.concatenate([result[0] for result in results]),
+                np.concatenate([result[1] for result in results]),
+                np.concatenate([result[2] for result in results]),
+                [info for result in results for info in result[3]])
+
+    def close(self):
+        """Stop the worker processes."""
+        for connection, process in self.workers:
+            connection.send(('close', None))
+            process.join()
+        self.workers = []
+
+
+def _step_envs(envs, actions):
+    """Step each of envs, resetting the ones whose games end."""
+    observations, rewards, dones, infos = [], [], [], []
+    for env, action in zip(envs, np.asarray(actions).tolist()):
+        observation, reward, done, info = env.step(action)
+        if done:
+            # Keep the last observation of the game that ended.
+            info['final_observation'] = observation
+            observation = env.reset()
+        observations.append(observation)
+        rewards.append(reward)
+        dones.append(done)
+        infos.append(info)
+    return (np.stack(observations), np.array(rewards, dtype=np.float64),
+            np.array(dones), infos)
+
+
+def _env_worker(connection, count, env_options):
+    """Run count games in a worker process, as the main process asks."""
+    envs = [AlienInvasionEnv(**env_options) for env in range(count)]
+    while True:
+        command, data = connection.recv()
+        if command == 'step':
+            connection.send(_step_envs(envs, data))
+        elif command == 'reset':
+            connection.send(np.stack([env.reset() for env in envs]))
+        else:
+            break
+    connection.close()
+
+
+if __name__ == '__main__':
+    # Time random players in one game, and in many games at once.
+    rng = np.random.default_rng(1)
+
+    for observation in ('features', 'screen'):
+        env = AlienInvasionEnv(observation=observation)
+        env.reset()
+        start = perf_counter()
+        for step, action in enumerate(rng.integers(0, len(ACTIONS), 20_000)):
+            observation_array, reward, done, info = env.step(action)
+            if done:
+                env.reset()
+        seconds = perf_counter() - start
+        print(f"1 game, {observation}: {20_000 / seconds:,.0f} steps/sec")
+
+    for workers in (0, 2):
+        envs = VectorEnv(16, workers=workers)
+        envs.reset()
+        start = perf_counter()
+        for step in range(1000):
+            envs.step(rng.integers(0, len(ACTIONS), 16))
+        seconds = perf_counter() - start
+        envs.close()
+        print(f"16 games, {workers} workers: "
+              f"{16 * 1000 / seconds:,.0f} steps/sec")
@@ -0,0 +1,207 @@
+import numpy as np
+import pygame
+
+from assets import assets
+from broadphase import SortAndSweep
+
+# Returned when a rect can't touch the fleet at all.
+NO_HITS = np.zeros(0, dtype=int)
+
+
+class Fleet:
+    """A class to store every alien in the fleet in NumPy arrays."""
+
+    def __init__(self, ai_game):
+        """Initialize an empty fleet."""
+        self.settings = ai_game.settings
+        self.screen_rect = ai_game.screen_rect
+
+        # Every alien shares the one alien image.
+        self.image = assets.get_image('images/alien.bmp')
+        self.mask = assets.get_mask('images/alien.bmp')
+        self.solid_sums = assets.get_solid_sums('images/alien.bmp')
+        self.width, self.height = self.image.get_size()
+
+        # Which places a rect of each size touches a solid pixel, built
+        #  by _hit_table() the first time that size is tested.
+        self.hit_tables = {}
+
+        # Aliens sorted by row, to find the ones near a rect quickly.
+        self.sweep = SortAndSweep()
+
+        self.empty()
+
+    def empty(self):
+        """Remove all aliens from the fleet."""
+        self.create(0, 0)
+
+    def create(self, number_aliens_x, number_rows):
+        """Fill the fleet with rows of aliens, one alien width apart."""
+        columns, rows = np.meshgrid(np.arange(number_aliens_x),
+                                    np.arange(number_rows))
+
+        # Exact positions of each alien's top left corner.
+        self.x = (self.width + 2 * self.width * columns.ravel()).astype(float)
+        self.y = (self.height + 2 * self.height * rows.ravel()).astype(float)
+        self.prev_x = self.x.copy()
+        self.alive = np.ones(self.x.size, dtype=bool)
+        self.count = self.x.size
+        self._find_bounds()
+
+        # The fleet moves as one, so the aliens are sorted once by where
+        #  they start, and lookups are shifted by how far it has dropped.
+        self.offset_y = 0.0
+        self.sweep.build(self.y, self.height)
+
+    def _find_bounds(self):
+        """Find the box around the live aliens."""
+        # The fleet moves as one, so the box only has to be searched for
+        #  again when aliens are removed.
+        if self.count:
+            x, y = self.x[self.alive], self.y[self.alive]
+            self.left = float(x.min())
+            self.right = float(x.max()) + self.width
+            self.top = float(y.min())
+            self.bottom = float(y.max()) + self.height
+        else:
+            self.left = self.right = self.top = self.bottom = 0.0
+
+    def __len__(self):
+        """Return the number of aliens still alive."""
+        return self.count
+
+    def update(self, dt=1):
+        """Move the whole fleet to the right or left."""
+        step = (self.settings.alien_speed * self.settings.fleet_direction
+                * dt)
+        self.prev_x[:] = self.x
+        self.x += step
+        self.left += step
+        self.right += step
+
+    def check_edges(self):
+        """Return true if any alien is at an edge of the screen."""
+        return bool(self.count) and (self.right >= self.screen_rect.right
+                                     or self.left <= 0)
+
+    def drop(self):
+        """Drop the entire fleet."""
+        self.y += self.settings.fleet_drop_speed
+        self.top += self.settings.fleet_drop_speed
+        self.bottom += self.settings.fleet_drop_speed
+        self.offset_y += self.settings.fleet_drop_speed
+
+    def check_bottom(self):
+        """Return true if any alien has reached the bottom of the screen."""
+        return bool(self.count) and self.bottom >= self.screen_rect.bottom
+
+    def collide_rect(self, rect, mask=None):
+        """
+        Return the indices of the live aliens that overlap rect. Given the
+        mask of what's in rect, only aliens whose solid pixels touch it count.
+        """
+        # Skip the array test when rect misses the whole fleet.
+        if (not self.count or rect.right <= self.left
+                or rect.left >= self.right or rect.bottom <= self.top
+                or rect.top >= self.bottom):
+            return NO_HITS
+
+        # Only the aliens in rows that rect spans need an exact test.
+        candidates = self.sweep.query(rect.top - self.offset_y,
+                                      rect.bottom - self.offset_y)
+        x = self.x[candidates]
+        hits = (self.alive[candidates]
+                & (x < rect.right) & (x + self.width > rect.left))
+        hits = candidates[hits]
+
+        # Masks are only compared for aliens whose rects already overlap.
+        if mask is not None and hits.size:
+            hits = self._collide_masks(hits, rect, mask)
+        return hits
+
+    def collide_rects(self, x, y, width, height, pixel_perfect=False):
+        """
+        Test many solid rects of the same size, with top left corners at x
+        and y, at once. Return the rect and alien index of every overlapping
+        pair. If pixel_perfect is set, a pair only counts when a solid pixel
+        of the alien is inside the rect.
+        """
+        rects, aliens = self.sweep.query_many(y - self.offset_y,
+                                              y + height - self.offset_y)
+        rect_x, alien_x = x[rects], self.x[aliens]
+        hits = (self.alive[aliens]
+                & (alien_x < rect_x + width) & (alien_x + self.width > rect_x))
+        rects, aliens = rects[hits], aliens[hits]
+
+        # Pixels are only checked for pairs whose rects already overlap.
+        if pixel_perfect and aliens.size:
+            # Look up where each rect sits on its alien in the table.
+            table = self._hit_table(width, height)
+            left = x[rects].astype(int) - self.x[aliens].astype(int)
+            top = y[rects].astype(int) - self.y[aliens].astype(int)
+            solid = table[left + width, top + height]
+            rects, aliens = rects[solid], aliens[solid]
+        return rects, aliens
+
+    def _hit_table(self, width, height):
+        """
+        Return a table of whether a solid width by height rect touches a
+        solid pixel of the alien, for the rect's top left corner at every
+        place from (-width, -height) to the alien's bottom right corner.
+        """
+        table = self.hit_tables.get((width, height))
+        if table is None:
+            # Clip each place the rect can be to the alien, and count the
+            #  solid pixels inside with the summed-area table.
+            left = np.arange(-width, self.width + 1)[:, None]
+            top = np.arange(-height, self.height + 1)[None, :]
+            right = np.clip(left + width, 0, self.width)
+            bottom = np.clip(top + height, 0, self.height)
+            left = np.clip(left, 0, self.width)
+            top = np.clip(top, 0, self.height)
+
+            sums = self.solid_sums
+            solid = (sums[right, bottom] - sums[left, bottom]
+                     - sums[right, top] + sums[left, top])
+            table = solid > 0
+            self.hit_tables[(width, height)] = table
+        return table
+
+    def _collide_masks(self, hits, rect, mask):
+        """Return the aliens in hits whose pixels touch mask at rect."""
+        overlap, alien_mask = mask.overlap, self.mask
+        x, y = self.x, self.y
+        return hits[[overlap(alien_mask, (int(x[alien]) - rect.x,
+                                          int(y[alien]) - rect.y)) is not None
+                     for alien in hits.tolist()]]
+
+    def kill(self, indices):
+        """Remove the aliens at indices from the fleet."""
+        self.alive[indices] = False
+        self.count = int(np.count_nonzero(self.alive))
+        self._find_bounds()
+
+    def lowest_alien(self):
+        """Return the index of the live alien nearest the bottom, or None."""
+        if not self.count:
+            return None
+        alive = np.flatnonzero(self.alive)
+        return alive[np.argmax(self.y[alive])]
+
+    def draw(self, screen, alpha=1):
+        """
+        Draw the fleet alpha of the way between its last two positions, and
+        return the rect around everything drawn.
+        """
+        alive = self.alive
+        x = self.prev_x[alive] + (self.x[alive] - self.prev_x[alive]) * alpha
+        image = self.image
+        screen.blits([(image, position) for position
+                      in zip(x.tolist(), self.y[alive].tolist())],
+                     doreturn=False)
+
+        # The whole fleet moves together, so one rect covers it.
+        shift = (self.prev_x[0] - self.x[0]) * (1 - alpha) if self.count else 0
+        return pygame.Rect(self.left + shift, self.top,
+                           self.right - self.left + 1,
+                           self.bottom - self.top).clip(screen.get_rect())
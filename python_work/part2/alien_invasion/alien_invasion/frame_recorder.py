@@ -0,0 +1,208 @@
+import os
+import queue
+import struct
+import sys
+import threading
+import zlib
+
+import numpy as np
+import pygame
+
+# A frame log starts with a header describing the frames' pixels, then has
+#  a record and compressed pixels for each frame. Most frames only store
+#  how they differ from the frame before.
+MAGIC = b'AIVID'
+VERSION = 1
+HEADER = struct.Struct('<5sBHHHBIIII')
+FRAME = struct.Struct('<I?I')
+
+# Frames are written to a frame log if the path ends in this, or as a
+#  folder of PNG images otherwise.
+LOG_EXTENSION = '.frames'
+
+
+class FrameRecorder:
+    """A class to save the game's frames to disk without slowing it down."""
+
+    def __init__(self, screen, path, buffer_frames=16, keyframe_every=120):
+        """
+        Record frames of screen to path. Up to buffer_frames frames wait in
+        memory to be written; frames that come while they're all waiting are
+        dropped. A whole frame is stored every keyframe_every frames.
+        """
+        self.screen = screen
+        self.path = path
+        self.keyframe_every = keyframe_every
+
+        # The ring of frames, copied in the display's own pixel format so
+        #  capturing one is a straight copy.
+        self.slots = [screen.copy() for slot in range(buffer_frames)]
+
+        # Simple queues never make the game wait for a lock the encoder
+        #  is holding.
+        self.free = queue.SimpleQueue()
+        for slot in range(buffer_frames):
+            self.free.put(slot)
+        self.filled = queue.SimpleQueue()
+
+        self.frames = 0
+        self.dropped = 0
+        self.written = 0
+
+        if path.endswith(LOG_EXTENSION):
+            self.log = open(path, 'wb')
+            width, height = screen.get_size()
+            self.log.write(HEADER.pack(MAGIC, VERSION, width, height,
+                                       screen.get_pitch(),
+                                       screen.get_bitsize(),
+                                       *screen.get_masks()))
+            self.previous = None
+        else:
+            self.log = None
+            os.makedirs(path, exist_ok=True)
+
+        self.encoder = threading.Thread(target=self._encode, daemon=True)
+        self.encoder.start()
+
+    def capture(self, block=False):
+        """
+        Copy the frame on the screen into the ring. If every slot is still
+        waiting to be written, drop the frame, unless block is set.
+        """
+        self.frames += 1
+        try:
+            slot = self.free.get(block)
+        except queue.Empty:
+            self.dropped += 1
+            return
+        self.slots[slot].blit(self.screen, (0, 0))
+        self.filled.put((slot, self.frames - 1))
+
+    def close(self):
+        """Wait for every captured frame to be written."""
+        self.filled.put(None)
+        self.encoder.join()
+        if self.log:
+            self.log.close()
+
+    def _encode(self):
+        """Write frames to disk as they're captured, until told to stop."""
+        # Compressing frames keeps a CPU busy, and would otherwise hold up
+        #  the copy of the next frame on a machine with only one or two.
+        _lower_thread_priority()
+        while True:
+            item = self.filled.get()
+            if item is None:
+                break
+            slot, number = item
+            if self.log:
+                self._write_log_frame(self.slots[slot], number)
+            else:
+                self._write_png(self.slots[slot], number)
+            self.free.put(slot)
+            self.written += 1
+
+    def _write_png(self, frame, number):
+        """Save one frame as a PNG image."""
+        # pygame.image.save() would hold up the game until it's done, so
+        #  the image is put together here with zlib, which lets the game
+        #  carry on while it compresses.
+        pixels = pygame.surfarray.pixels3d(frame)
+        rgb = np.ascontiguousarray(pixels.transpose(1, 0, 2))
+        del pixels
+        with open(os.path.join(self.path, f'frame_{number:06d}.png'),
+                  'wb') as f:
+            f.write(png_bytes(rgb))
+
+    def _write_log_frame(self, frame, number):
+        """Add one frame to the frame log."""
+        buffer = frame.get_buffer()
+        pixels = np.frombuffer(buffer, np.uint8).copy()
+        del buffer
+
+        keyframe = self.written % self.keyframe_every == 0
+        if keyframe:
+            data = pixels
+        else:
+            # Pixels that didn't change become zeros, which compress well.
+            data = np.bitwise_xor(pixels, self.previous)
+        self.previous = pixels
+
+        data = zlib.compress(data, 1)
+        self.log.write(FRAME.pack(number, keyframe, len(data)))
+        self.log.write(data)
+
+
+def _lower_thread_priority():
+    """Let every other thread in the game run before the calling thread."""
+    # Only Linux can set the priority of a single thread.
+    if sys.platform.startswith('linux'):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except OSError:
+            pass
+
+
+def png_bytes(rgb):
+    """Return a PNG image of an array of rows of RGB pixels."""
+    height, width = rgb.shape[:2]
+
+    # Each row of the image starts with a 0, for no filtering.
+    rows = np.zeros((height, width * 3 + 1), np.uint8)
+    rows[:, 1:] = rgb.reshape(height, -1)
+
+    def chunk(kind, data):
+        crc = zlib.crc32(data, zlib.crc32(kind))
+        return b''.join((struct.pack('>I', len(data)), kind, data,
+                         struct.pack('>I', crc)))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b''.join((b'\x89PNG\r\n\x1a\n', chunk(b'IHDR', header),
+                     chunk(b'IDAT', zlib.compress(rows, 1)),
+                     chunk(b'IEND', b'')))
+
+
+def read_frame_log(path):
+    """Yield the number and a Surface for each frame in a frame log."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    (magic, version, width, height, pitch, bitsize, *masks) = (
+        HEADER.unpack_from(data))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} isn't an Alien Invasion frame log.")
+
+    offset = HEADER.size
+    pixels = None
+    while offset < len(data):
+        number, keyframe, size = FRAME.unpack_from(data, offset)
+        offset += FRAME.size
+        frame = np.frombuffer(zlib.decompress(data[offset:offset + size]),
+                              np.uint8)
+        offset += size
+        pixels = frame if keyframe else np.bitwise_xor(frame, pixels)
+
+        surface = pygame.Surface((width, height), 0, bitsize, masks)
+        if surface.get_pitch() != pitch:
+            raise ValueError(f"{path} has rows of an unexpected size.")
+        surface.get_buffer().write(pixels.tobytes())
+        yield number, surface
+
+
+def export_frames(path, folder):
+    """Save every frame in a frame log as a PNG image in folder."""
+    os.makedirs(folder, exist_ok=True)
+    count = 0
+    for number, surface in read_frame_log(path):
+        pygame.image.save(surface,
+                          os.path.join(folder, f'frame_{number:06d}.png'))
+        count += 1
+    return count
+
+
+if __name__ == '__main__':
+    # Turn a frame log into a folder of PNG images, for a video editor.
+    if len(sys.argv) != 3:
+        sys.exit(f"Usage: python {sys.argv[0]} SESSION{LOG_EXTENSION} "
+                 f"FOLDER")
+    count = export_frames(sys.argv[1], sys.argv[2])
+    print(f"Exported {count} frames to {sys.argv[2]}.")
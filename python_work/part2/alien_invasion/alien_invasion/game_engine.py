@@ -0,0 +1,241 @@
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+from settings import Settings
+from game_stats import GameStats
+from ship import Ship
+from laser_pool import LaserPool
+from fleet import Fleet
+from game_state import GameState
+from profiler import FrameProfiler
+
+
+class GameEngine:
+    """A class to run the rules of Alien Invasion without a display."""
+
+    def __init__(self, settings=None):
+        """Initialize the game state, with no window attached."""
+        self.settings = settings if settings else Settings()
+        self.screen_rect = pygame.Rect(0, 0, self.settings.screen_width,
+                                       self.settings.screen_height)
+
+        self.stats = GameStats(self)
+        self.state = GameState()
+        self.difficulty = 'easy'
+
+        # Times each phase of the update when it's enabled.
+        self.profiler = FrameProfiler()
+
+        self.ship = Ship(self)
+        self.lasers = LaserPool(self)
+        self.aliens = Fleet(self)
+
+        # Set when the ship is lost, so a display can react to it.
+        self.ship_was_hit = False
+
+        # The first fleet is made when the first game starts.
+
+    def start_game(self, difficulty):
+        """Start a new game at the given difficulty."""
+        # A game that's restarted still counts for the leaderboard.
+        if self.stats.game_active:
+            self.stats.save_score(self.difficulty)
+        self.difficulty = difficulty
+
+        # Reset the game statistics.
+        self.stats.reset_stats()
+        self.stats.load_high_score(difficulty)
+        self.stats.game_active = True
+        self.state.set(GameState.PLAYING)
+
+        # Get rid of any remaining aliens and lasers.
+        self.aliens.empty()
+        self.lasers.empty()
+
+        # Create a new fleet and center the ship.
+        self._create_fleet()
+        self.ship.center_ship()
+
+        # Initialize game settings.
+        self.settings.initialize_dynamic_settings(difficulty)
+
+    def update(self, dt=1):
+        """Advance the game by one tick covering dt reference frames."""
+        self.state.update(dt / self.settings.reference_fps)
+        if self.state.name == GameState.PLAYING:
+            for shot in range(self.settings.stress_shots_per_tick):
+                self.lasers.fire(self.ship.rect.midtop)
+            self.ship.update(dt)
+            self.profiler.lap('ship.update')
+            self._update_lasers(dt)
+            self.profiler.lap('_update_lasers')
+            self._update_aliens(dt)
+            self.profiler.lap('_update_aliens')
+
+    def fire_laser(self):
+        """Fire a laser from the pool, if the limit allows it."""
+        if self.state.name != GameState.PLAYING:
+            return
+        if len(self.lasers) < self.settings.lasers_allowed:
+            self.lasers.fire(self.ship.rect.midtop)
+
+    def _update_lasers(self, dt=1):
+        """Update position of lasers and get rid of old lasers."""
+        # Update laser postitions, and put away lasers that have
+        #  disappeared.
+        self.lasers.update(dt)
+
+        self._check_laser_alien_collisions()
+
+    def _check_laser_alien_collisions(self):
+        """Respond to laser-alien collisions."""
+        # Remove any lasers and aliens that have collided.
+        # Only lasers inside the box around the fleet can hit anything, and
+        #  they're all tested at once.
+        lasers = self.lasers.near(self.aliens)
+        if lasers.size:
+            shots, hits = self.aliens.collide_rects(
+                self.lasers.x[lasers], self.lasers.y[lasers],
+                self.lasers.width, self.lasers.height,
+                self.settings.mask_collisions)
+            hit_aliens = np.unique(hits)
+            if hit_aliens.size:
+                self.aliens.kill(hit_aliens)
+                self.stats.score += (self.settings.alien_points
+                                     * hit_aliens.size)
+                self._check_high_score()
+                if self.settings.laser_collide_remove:
+                    for laser in np.unique(lasers[shots]).tolist():
+                        self.lasers.remove(laser)
+
+        self._start_new_level()
+
+    def _check_high_score(self):
+        """Check to see if there is a new high score."""
+        if self.stats.score > self.stats.high_score:
+            self.stats.high_score = self.stats.score
+
+    def _start_new_level(self):
+        # Remove existing lasers and create a new fleet
+        if not self.aliens:
+            self.lasers.empty()
+            self._create_fleet()
+            self.settings.increase_speed()
+
+            # Increase level.
+            self.stats.level += 1
+
+    def _create_fleet(self):
+        """Create the fleet of aliens."""
+        # Find the number of aliens in a row.
+        # Spacing between each alien is equal to one alien width.
+        alien_width, alien_height = self.aliens.width, self.aliens.height
+        available_space_x = self.settings.screen_width - (2 * alien_width)
+        number_aliens_x = available_space_x // (2 * alien_width)
+
+        # Determine the number of rows of aliens that fit on the screen.
+        ship_height = self.ship.rect.height
+        available_space_y = (self.settings.screen_height
+                             - (3 * alien_height) - ship_height)
+        number_rows = available_space_y // (2 * alien_height)
+
+        # Create the full fleet of aliens.
+        self.aliens.create(number_aliens_x, number_rows)
+
+    def _check_fleet_edges(self):
+        """Respond appropriately if any aliens have reached an edge."""
+        if self.aliens.check_edges():
+            self._change_fleet_direction()
+
+    def _check_aliens_bottom(self):
+        """Check if any aliens have reached the bottom of the screen."""
+        if self.aliens.check_bottom():
+            # Treat this the same as if the ship got hit.
+            self._ship_hit()
+
+    def _change_fleet_direction(self):
+        """Drop the entire fleet and change the fleet's direction."""
+        self.aliens.drop()
+        self.settings.fleet_direction *= -1
+
+    def _update_aliens(self, dt=1):
+        """
+        Check if the fleet is at an edge, then update the positions of all
+        aliens in the fleet.
+        """
+        self._check_fleet_edges()
+        self.aliens.update(dt)
+
+        # Look for alien-ship collisions.
+        mask = self.ship.mask if self.settings.mask_collisions else None
+        if len(self.aliens.collide_rect(self.ship.rect, mask)):
+            self._ship_hit()
+
+        # Look for aliens hitting the bottom of the screen.
+        self._check_aliens_bottom()
+
+    def _ship_hit(self):
+        """Respond to the ship being hit by an alien."""
+        self.ship_was_hit = True
+        if self.stats.ships_left > 0:
+            # Decrement ships_left.
+            self.stats.ships_left -= 1
+
+            # Get rid of any remaining aliens and lasers.
+            self.aliens.empty()
+            self.lasers.empty()
+
+            # Create a new fleet and center the ship.
+            self._create_fleet()
+            self.ship.center_ship()
+
+            # Pause before the new fleet starts moving.
+            self.state.set(GameState.RESPAWNING, self.settings.respawn_time,
+                           GameState.PLAYING)
+        else:
+            self.stats.game_active = False
+            self.stats.save_score(self.difficulty)
+            self.state.set(GameState.GAME_OVER, self.settings.game_over_time,
+                           GameState.MENU)
+
+
+def chase_policy(engine):
+    """A simple player that follows the lowest alien and keeps firing."""
+    ship, fleet = engine.ship, engine.aliens
+    target = fleet.lowest_alien()
+    if target is None:
+        ship.moving_right = ship.moving_left = False
+    else:
+        centerx = fleet.x[target] + fleet.width / 2
+        ship.moving_right = centerx > ship.rect.right
+        ship.moving_left = centerx < ship.rect.left
+    engine.fire_laser()
+
+
+def play_game(engine, difficulty, policy=chase_policy, max_ticks=100_000):
+    """Play one game without a display, and return the ticks it lasted."""
+    dt = engine.settings.reference_fps / engine.settings.tick_rate
+    engine.start_game(difficulty)
+    ticks = 0
+    while engine.stats.game_active and ticks < max_ticks:
+        policy(engine)
+        engine.update(dt)
+        ticks += 1
+    return ticks
+
+
+if __name__ == '__main__':
+    # Play a game at each difficulty and report how fast the engine runs.
+    #  These games don't go on the leaderboards.
+    settings = Settings()
+    settings.score_file = None
+    engine = GameEngine(settings)
+    for difficulty in engine.settings.difficulties:
+        start = perf_counter()
+        ticks = play_game(engine, difficulty, max_ticks=20_000)
+        seconds = perf_counter() - start
+        print(f"{difficulty}: level {engine.stats.level}, "
+              f"score {engine.stats.score}, {ticks} ticks, "
+              f"{ticks / seconds:,.0f} ticks/sec")
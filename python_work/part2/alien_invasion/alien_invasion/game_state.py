@@ -0,0 +1,28 @@
+class GameState:
+    """A class to track which part of the game is running, and for how long."""
+
+    MENU = 'menu'
+    PLAYING = 'playing'
+    RESPAWNING = 'respawning'
+    GAME_OVER = 'game over'
+
+    def __init__(self):
+        """Start at the menu, with no timer running."""
+        self.set(self.MENU)
+
+    def set(self, name, duration=0, next_name=None):
+        """
+        Switch to state name. If next_name is given, switch to it once
+        duration seconds of game time have passed.
+        """
+        self.name = name
+        self.time_left = duration
+        self.next_name = next_name
+
+    def update(self, seconds):
+        """Count down the timer, and move on to the next state when done."""
+        if self.next_name is None:
+            return
+        self.time_left -= seconds
+        if self.time_left <= 0:
+            self.set(self.next_name)
@@ -1,3 +1,6 @@
+from score_store import ScoreStore
+
+
 class GameStats:
     """Track statistics for Alien Invasion."""
 
@@ -9,28 +12,33 @@ class GameStats:
         # Start game in an inactive state.
         self.game_active = False
 
+        # The leaderboards are loaded once, and saved as games end.
+        self.scores = ScoreStore(self.settings.score_file,
+                                 self.settings.leaderboard_size)
+
         # High score should never be reset.
-        self.high_score = self._get_high_score()
+        self.high_score = self.scores.high_score('easy')
 
         # Button status
         self.show_play = 1
 
+        # Frame timing statistics.
+        self.fps = 0.0
+        self.frames = 0
+        self.ticks = 0
+        self.dropped_ticks = 0
+
     def reset_stats(self):
         """Initialize statistics that can change during the game."""
         self.ships_left = self.settings.ship_limit
         self.score = 0
         self.level = 1
 
-    def _get_high_score(self):
-        file = "high_score.txt"
-        with open(file) as f:
-            high_score = int(f.read())
-            if high_score:
-                return high_score
-            else:
-                return 0
-
-    def _export_high_score(self):
-        file = "high_score.txt"
-        with open(file, "w") as f:
-            f.write(str(self.score))
+    def load_high_score(self, difficulty):
+        """Show the high score for the difficulty being played."""
+        self.high_score = self.scores.high_score(difficulty)
+
+    def save_score(self, difficulty):
+        """Add the score of the game just played to the leaderboard."""
+        if self.score:
+            self.scores.add_score(difficulty, self.score, self.level)
@@ -0,0 +1,69 @@
+import random
+import struct
+
+import pygame
+
+# A recording starts with a header, then has one record for each event.
+MAGIC = b'AIREC'
+VERSION = 1
+HEADER = struct.Struct('<5sBQHI')
+RECORD = struct.Struct('<IBiHhh')
+
+# The events that drive the game, by the code stored for each one.
+EVENT_TYPES = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN)
+
+
+class InputRecorder:
+    """A class to record the player's input, tick by tick."""
+
+    def __init__(self, path, seed=None, tick_rate=120):
+        """Start a recording, and seed the random numbers to match it."""
+        self.path = path
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.tick_rate = tick_rate
+        random.seed(self.seed)
+
+        # (tick, code, key, button, x, y) for each event, in order.
+        self.records = []
+
+    def record(self, tick, event):
+        """Record an event handled before the given tick."""
+        if event.type not in EVENT_TYPES:
+            return
+        code = EVENT_TYPES.index(event.type)
+        key = getattr(event, 'key', 0)
+        button = getattr(event, 'button', 0)
+        x, y = getattr(event, 'pos', (0, 0))
+        self.records.append((tick, code, key, button, x, y))
+
+    def save(self, ticks):
+        """Write the recording of a session ticks ticks long."""
+        with open(self.path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.tick_rate,
+                                ticks))
+            for record in self.records:
+                f.write(RECORD.pack(*record))
+
+
+class Recording:
+    """A class to read back a recording of the player's input."""
+
+    def __init__(self, path):
+        """Load the recording stored at path."""
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, self.seed, self.tick_rate, self.ticks = (
+            HEADER.unpack_from(data))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} isn't an Alien Invasion recording.")
+
+        self.records = list(RECORD.iter_unpack(data[HEADER.size:]))
+
+    def events_by_tick(self):
+        """Return a dict of the events handled before each tick."""
+        events = {}
+        for tick, code, key, button, x, y in self.records:
+            event = pygame.event.Event(EVENT_TYPES[code], key=key,
+                                       button=button, pos=(x, y))
+            events.setdefault(tick, []).append(event)
+        return events
@@ -0,0 +1,108 @@
+import numpy as np
+import pygame
+
+# Returned when no laser is near the fleet.
+NO_LASERS = np.zeros(0, dtype=int)
+
+
+class LaserPool:
+    """A class to manage a fixed pool of lasers stored in NumPy arrays."""
+
+    def __init__(self, ai_game):
+        """Set aside room for every laser the game can have at once."""
+        self.settings = ai_game.settings
+        self.size = self.settings.laser_pool_size
+
+        # The top left corner of each laser, and whether it's in flight.
+        self.x = np.zeros(self.size)
+        self.y = np.zeros(self.size)
+        self.prev_y = np.zeros(self.size)
+        self.active = np.zeros(self.size, dtype=bool)
+
+        # Slots of lasers that aren't in flight, ready to be fired.
+        self.free = list(range(self.size - 1, -1, -1))
+
+        # Every laser in flight is in a slot below top, so only those slots
+        #  need to be looked at.
+        self.top = 0
+
+        self.image = None
+        self._check_image()
+
+    def __len__(self):
+        """Return the number of lasers in flight."""
+        return self.size - len(self.free)
+
+    def empty(self):
+        """Put every laser back in the pool."""
+        lasers = np.flatnonzero(self.active[:self.top])
+        self.active[lasers] = False
+        self.free.extend(lasers.tolist())
+        self.top = 0
+
+    def _check_image(self):
+        """Make the image every laser is drawn with, if the settings change."""
+        size = (self.settings.laser_width, self.settings.laser_height)
+        if self.image is not None and (self.image.get_size(), self.color) == (
+                size, self.settings.laser_color):
+            return
+        self.width, self.height = size
+        self.color = self.settings.laser_color
+        self.image = pygame.Surface(size)
+        if pygame.display.get_surface():
+            self.image = self.image.convert()
+        self.image.fill(self.color)
+
+    def fire(self, midtop):
+        """Fire a laser with its top middle at midtop, if one is free."""
+        if not self.free:
+            return
+        self._check_image()
+        laser = self.free.pop()
+        self.x[laser] = midtop[0] - self.width // 2
+        self.y[laser] = self.prev_y[laser] = midtop[1]
+        self.active[laser] = True
+        self.top = max(self.top, laser + 1)
+
+    def remove(self, laser):
+        """Put one laser back in the pool."""
+        self.active[laser] = False
+        self.free.append(laser)
+
+    def update(self, dt=1):
+        """Move the lasers up the screen and put away ones that are gone."""
+        if not len(self):
+            self.top = 0
+            return
+        top = self.top
+        y = self.y[:top]
+        self.prev_y[:top] = y
+        y -= self.settings.laser_speed * dt
+
+        active = self.active[:top]
+        gone = np.flatnonzero(active & (y + self.height <= 0))
+        if gone.size:
+            active[gone] = False
+            self.free.extend(gone.tolist())
+
+    def near(self, fleet):
+        """Return the lasers in flight that overlap the box around fleet."""
+        if not len(self) or not len(fleet):
+            return NO_LASERS
+        x, y = self.x[:self.top], self.y[:self.top]
+        near = (self.active[:self.top]
+                & (x < fleet.right) & (x + self.width > fleet.left)
+                & (y < fleet.bottom) & (y + self.height > fleet.top))
+        return np.flatnonzero(near)
+
+    def draw(self, screen, alpha=1):
+        """
+        Draw the lasers alpha of the way between their last two positions,
+        and return the rects they were drawn in.
+        """
+        lasers = np.flatnonzero(self.active[:self.top])
+        prev_y = self.prev_y[lasers]
+        y = prev_y + (self.y[lasers] - prev_y) * alpha
+        image = self.image
+        return screen.blits([(image, position) for position
+                             in zip(self.x[lasers].tolist(), y.tolist())])
@@ -0,0 +1,174 @@
+import csv
+import json
+import statistics
+from collections import deque
+from time import perf_counter
+
+
+class FrameProfiler:
+    """A class to time each phase of every frame of the game loop."""
+
+    PHASES = ('_check_events', 'ship.update', '_update_lasers',
+              '_update_aliens', '_update_screen', 'display.flip')
+
+    def __init__(self, enabled=False, history=300):
+        """Initialize the profiler, keeping history frames of timings."""
+        self.enabled = enabled
+        self.history = {phase: deque(maxlen=history) for phase in self.PHASES}
+        self.frame = dict.fromkeys(self.PHASES, 0.0)
+        self.last = 0.0
+
+        # Every profiled frame, kept to write out when the game ends.
+        self.trace = []
+
+    def toggle(self):
+        """Turn profiling on or off, forgetting any half-timed frame."""
+        self.enabled = not self.enabled
+        for phase in self.frame:
+            self.frame[phase] = 0.0
+        self.last = perf_counter()
+
+    def start_frame(self):
+        """Start timing a new frame."""
+        if not self.enabled:
+            return
+        for phase in self.frame:
+            self.frame[phase] = 0.0
+        self.last = perf_counter()
+
+    def lap(self, phase):
+        """Add the time since the last lap to phase."""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self.frame[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        """Store the timings of the frame that just finished."""
+        if not self.enabled:
+            return
+        for phase, seconds in self.frame.items():
+            self.history[phase].append(seconds)
+        self.trace.append(tuple(self.frame.values()))
+
+    def percentiles(self, phase):
+        """Return the p50, p95 and p99 times for phase, in milliseconds."""
+        times = sorted(self.history[phase])
+        if not times:
+            return 0.0, 0.0, 0.0
+        last = len(times) - 1
+        return tuple(times[round(last * share)] * 1000
+                     for share in (0.50, 0.95, 0.99))
+
+    def report_lines(self):
+        """Return a line of percentiles for each phase."""
+        lines = []
+        for phase in self.PHASES:
+            p50, p95, p99 = self.percentiles(phase)
+            lines.append(f"{phase}: {p50:.2f} / {p95:.2f} / {p99:.2f} ms")
+        return lines
+
+    def write_trace(self, path):
+        """Write every profiled frame to path, as CSV or JSON."""
+        if not self.trace:
+            return
+        if path.endswith('.json'):
+            frames = [dict(zip(self.PHASES, frame)) for frame in self.trace]
+            with open(path, 'w') as f:
+                json.dump(frames, f)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.PHASES)
+                writer.writerows(self.trace)
+
+
+class StartupTrace:
+    """A class to time each step of the game starting up."""
+
+    def __init__(self, enabled=False):
+        """Start the clock, if tracing is enabled."""
+        self.enabled = enabled
+        self.start = self.last = perf_counter()
+        self.steps = []
+
+    def lap(self, step):
+        """Note the time taken since the last step by step."""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self.steps.append((step, now - self.last))
+        self.last = now
+
+    def report_lines(self):
+        """Return a line for each step, and one for the whole start-up."""
+        lines = [f"{step}: {seconds * 1000:.1f} ms"
+                 for step, seconds in self.steps]
+        lines.append(f"First frame after {(self.last - self.start) * 1000:.1f}"
+                     f" ms")
+        return lines
+
+
+class LatencyTracker:
+    """
+    A class to measure how long input takes to reach the screen, and how
+    evenly the simulation's ticks are spaced.
+    """
+
+    def __init__(self, history=300):
+        """Initialize the tracker, keeping history of each measurement."""
+        # Input that hasn't been shown yet: when it was handled, and the
+        #  first tick that includes it.
+        self.pending = []
+        self.latencies = deque(maxlen=history)
+        self.tick_intervals = deque(maxlen=history)
+        self.last_tick = None
+
+    def input_handled(self, ticks):
+        """Note input handled after ticks ticks of the simulation."""
+        self.pending.append((perf_counter(), ticks + 1))
+
+    def frame_shown(self, ticks):
+        """Note that a frame showing the first ticks ticks was just shown."""
+        if not self.pending:
+            return
+        now = perf_counter()
+        waiting = []
+        for handled, tick in self.pending:
+            if tick <= ticks:
+                self.latencies.append(now - handled)
+            else:
+                waiting.append((handled, tick))
+        self.pending = waiting
+
+    def tick_started(self):
+        """Note the start of a tick of the simulation."""
+        now = perf_counter()
+        if self.last_tick is not None:
+            self.tick_intervals.append(now - self.last_tick)
+        self.last_tick = now
+
+    def latency_percentiles(self):
+        """Return the p50, p95 and p99 input latency, in milliseconds."""
+        times = sorted(self.latencies)
+        if not times:
+            return 0.0, 0.0, 0.0
+        last = len(times) - 1
+        return tuple(times[round(last * share)] * 1000
+                     for share in (0.50, 0.95, 0.99))
+
+    def tick_jitter(self):
+        """
+        Return the standard deviation of the time between ticks, in
+        milliseconds.
+        """
+        if len(self.tick_intervals) < 2:
+            return 0.0
+        return statistics.pstdev(self.tick_intervals) * 1000
+
+    def report_lines(self):
+        """Return a line for input latency, and one for tick jitter."""
+        p50, p95, p99 = self.latency_percentiles()
+        return [f"input to screen: {p50:.2f} / {p95:.2f} / {p99:.2f} ms",
+                f"tick jitter: {self.tick_jitter():.2f} ms"]
@@ -0,0 +1,54 @@
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class QualityController:
+    """A class to trade optional detail for frame rate, and back again."""
+
+    def __init__(self, tiers, target_fps=60, window=30):
+        """
+        Start at the first, best tier. Frame times are averaged over window
+        frames before the tier is changed.
+        """
+        self.tiers = tiers
+        self.tier = 0
+        self.budget = 1 / target_fps
+
+        # How long the last few frames took to make, not counting waiting.
+        self.frame_times = deque(maxlen=window)
+
+    @property
+    def name(self):
+        """Return the name of the current tier."""
+        return self.tiers[self.tier]['name']
+
+    def get(self, option):
+        """Return the value of option at the current tier."""
+        return self.tiers[self.tier][option]
+
+    def update(self, frame_time):
+        """
+        Add the seconds the last frame took to make. Return True if the
+        tier changed.
+        """
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        mean = sum(self.frame_times) / len(self.frame_times)
+        if mean > self.budget * 0.9 and self.tier < len(self.tiers) - 1:
+            self.tier += 1
+        elif mean < self.budget * 0.5 and self.tier > 0:
+            # Only step back up with plenty of room, so the tier doesn't
+            #  flip back and forth.
+            self.tier -= 1
+        else:
+            return False
+
+        # Give the new tier a full window before judging it.
+        self.frame_times.clear()
+        logger.info("Quality %s: frames took %.1f ms, aiming for %.1f ms.",
+                    self.name, mean * 1000, self.budget * 1000)
+        return True
@@ -0,0 +1,94 @@
+import sys
+
+import pygame
+
+from ecs import World, move, render
+from timestep import FixedTimestep
+
+
+class Scene:
+    """
+    A class to run a game whose objects are entities in a World. Each game
+    only defines its entities, its rules and its controls.
+    """
+
+    # Entity kinds drawn by render(), back to front.
+    draw_order = []
+
+    def __init__(self, settings, caption="Alien Invasion"):
+        """Open the window and make an empty world for the scene."""
+        # Only start the parts of pygame the scenes use.
+        pygame.display.init()
+        pygame.font.init()
+        self.settings = settings
+        self.screen = pygame.display.set_mode(
+            (self.settings.screen_width, self.settings.screen_height))
+        self.screen_rect = self.screen.get_rect()
+        pygame.display.set_caption(caption)
+
+        self.world = World()
+        # Runs the ticks, and counts those run and dropped.
+        self.timestep = FixedTimestep(settings)
+
+    def run(self):
+        """Start the main game loop."""
+        while True:
+            self.timestep.wait(self.settings.fps)
+            self._check_events()
+
+            # Catch the simulation up to now, dropping the ticks we can't.
+            self.timestep.catch_up(self.tick, self.settings.max_catchup_ticks)
+
+            # Draw the entities part of the way to their next tick.
+            self.draw(self.timestep.alpha)
+            pygame.display.flip()
+
+    def _check_events(self):
+        """Respond to key presses and mouse events."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                sys.exit(0)
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_q:
+                    sys.exit(0)
+                self.key_down(event.key)
+            elif event.type == pygame.KEYUP:
+                self.key_up(event.key)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.click(event.pos)
+
+    def tick(self, dt=1):
+        """Move every entity, then apply the scene's rules."""
+        self.steer(dt)
+        move(self.world, dt)
+        self.update(dt)
+
+    def draw(self, alpha=1):
+        """
+        Draw the background and every entity, alpha of the way from the last
+        tick to the next.
+        """
+        self.draw_background()
+        render(self.world, self.screen, self.draw_order,
+               (1 - alpha) * self.timestep.tick_dt)
+
+    # Scenes override the methods below.
+
+    def draw_background(self):
+        """Draw what goes behind the entities."""
+        self.screen.fill(self.settings.bg_color)
+
+    def key_down(self, key):
+        """Respond to a key being pressed."""
+
+    def key_up(self, key):
+        """Respond to a key being released."""
+
+    def click(self, pos):
+        """Respond to a mouse click at pos."""
+
+    def steer(self, dt=1):
+        """Set the velocities of the entities the player controls."""
+
+    def update(self, dt=1):
+        """Apply the scene's rules after everything has moved."""
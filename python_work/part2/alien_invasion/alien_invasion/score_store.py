@@ -0,0 +1,117 @@
+import os
+import queue
+import sqlite3
+import threading
+from time import time
+
+# Score files are kept next to the game, wherever it's run from.
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The old single high score, from before there were leaderboards.
+LEGACY_FILE = os.path.join(GAME_DIR, 'high_score.txt')
+
+
+class ScoreStore:
+    """A class to keep a leaderboard of scores for each difficulty."""
+
+    def __init__(self, filename='high_scores.db', size=10):
+        """
+        Load every leaderboard from filename once. With no filename, the
+        scores are only kept in memory.
+        """
+        self.path = os.path.join(GAME_DIR, filename) if filename else None
+        self.size = size
+
+        # The best scores for each difficulty, as (score, level) pairs,
+        #  highest first.
+        self.leaderboards = {}
+
+        # Scores waiting to be written by the writer thread.
+        self.pending = queue.Queue()
+        self.writer = None
+
+        self._load()
+
+    def _load(self):
+        """Read the leaderboards from disk."""
+        if not self.path:
+            return
+        if not os.path.exists(self.path):
+            self._import_legacy_score()
+            return
+
+        connection = sqlite3.connect(self.path)
+        try:
+            rows = connection.execute(
+                'SELECT difficulty, score, level FROM scores '
+                'ORDER BY score DESC').fetchall()
+        finally:
+            connection.close()
+        for difficulty, score, level in rows:
+            self._add_to_leaderboard(difficulty, score, level)
+
+    def _import_legacy_score(self):
+        """Carry the old high score over to the easy leaderboard."""
+        try:
+            with open(LEGACY_FILE) as f:
+                score = int(f.read())
+        except (OSError, ValueError):
+            return
+        if score:
+            # It's written to the new file along with the first new score.
+            self._add_to_leaderboard('easy', score, 0)
+            self.pending.put(('easy', score, 0, time()))
+
+    def _add_to_leaderboard(self, difficulty, score, level):
+        """Put a score in its place on the leaderboard in memory."""
+        leaderboard = self.leaderboards.setdefault(difficulty, [])
+        leaderboard.append((score, level))
+        leaderboard.sort(reverse=True)
+        del leaderboard[self.size:]
+
+    def add_score(self, difficulty, score, level):
+        """Record a finished game, writing it to disk in the background."""
+        self._add_to_leaderboard(difficulty, score, level)
+        if not self.path:
+            return
+        if not self.writer:
+            self.writer = threading.Thread(target=self._write_scores,
+                                           daemon=True)
+            self.writer.start()
+        self.pending.put((difficulty, score, level, time()))
+
+    def high_score(self, difficulty):
+        """Return the best score for difficulty."""
+        leaderboard = self.leaderboards.get(difficulty)
+        return leaderboard[0][0] if leaderboard else 0
+
+    def leaderboard(self, difficulty):
+        """Return the best (score, level) pairs for difficulty."""
+        return list(self.leaderboards.get(difficulty, []))
+
+    def close(self):
+        """Wait for every waiting score to be written."""
+        if self.writer:
+            self.pending.put(None)
+            self.writer.join()
+            self.writer = None
+
+    def _write_scores(self):
+        """Write scores to disk as they arrive, until told to stop."""
+        # An SQLite connection can only be used by the thread that made it.
+        connection = sqlite3.connect(self.path)
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS scores (difficulty TEXT, '
+                'score INTEGER, level INTEGER, time REAL)')
+
+        while True:
+            row = self.pending.get()
+            if row is None:
+                break
+            # Each score is written in its own transaction, so a crash
+            #  can't leave a half-written file behind.
+            with connection:
+                connection.execute('INSERT INTO scores VALUES (?, ?, ?, ?)',
+                                   row)
+        connection.close()
@@ -1,7 +1,7 @@
-import pygame.font
 from pygame.sprite import Group
 
 from ship import Ship
+from text_cache import text_cache
 
 
 class Scoreboard:
@@ -13,21 +13,33 @@ class Scoreboard:
         self.screen = ai_game.screen
         self.screen_rect = self.screen.get_rect()
         self.settings = ai_game.settings
-        self.stats = ai_game.stats
+        self.stats = ai_game.view.stats
 
         # Font settings for scoring information.
         self.text_color = (30, 30, 30)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = text_cache.get_font(48)
+
+        # The strings on screen, so images are only rendered on a change.
+        self.score_str = self.high_score_str = self.level_str = None
+
+        # Performance overlay lines, shown while profiling.
+        self.profile_font = text_cache.get_font(24)
+        self.profile_images = []
 
         self.prep_images()
 
     def prep_score(self):
         """Turn the score into a rendered image."""
+        self.shown_score = self.stats.score
         rounded_score = round(self.stats.score, -1)
         score_str = "{:,}".format(rounded_score)
-        self.score_image = self.font.render(score_str, True,
-                                            self.text_color,
-                                            self.settings.bg_color)
+        if score_str == self.score_str:
+            return
+        self.score_str = score_str
+        self.changed = True
+        self.score_image = text_cache.render(self.font, score_str,
+                                             self.text_color,
+                                             self.settings.bg_color)
 
         # Display the score at the top right of the screen.
         self.score_rect = self.score_image.get_rect()
@@ -36,29 +48,33 @@ class Scoreboard:
 
     def prep_high_score(self):
         """Turn the high score into a rendered image."""
+        self.shown_high_score = self.stats.high_score
         high_score = round(self.stats.high_score, -1)
         high_score_str = "{:,}".format(high_score)
-        self.high_score_image = self.font.render(high_score_str, True,
-                                                 self.text_color,
-                                                 self.settings.bg_color)
+        if high_score_str == self.high_score_str:
+            return
+        self.high_score_str = high_score_str
+        self.changed = True
+        self.high_score_image = text_cache.render(self.font, high_score_str,
+                                                  self.text_color,
+                                                  self.settings.bg_color)
 
         # Center the high score at the top of the scree.
         self.high_score_rect = self.high_score_image.get_rect()
         self.high_score_rect.centerx = self.screen_rect.centerx
         self.high_score_rect.top = self.score_rect.top
 
-    def check_high_score(self):
-        """Check to see if there is a new high score."""
-        if self.stats.score > self.stats.high_score:
-            self.stats.high_score = self.stats.score
-            self.prep_high_score()
-
     def prep_level(self):
         """Turn the level into a rendered image."""
+        self.shown_level = self.stats.level
         level_str = str(self.stats.level)
-        self.level_image = self.font.render(level_str, True,
-                                            self.text_color,
-                                            self.settings.bg_color)
+        if level_str == self.level_str:
+            return
+        self.level_str = level_str
+        self.changed = True
+        self.level_image = text_cache.render(self.font, level_str,
+                                             self.text_color,
+                                             self.settings.bg_color)
 
         # Position the level below the score.
         self.level_rect = self.level_image.get_rect()
@@ -67,6 +83,8 @@ class Scoreboard:
 
     def prep_ships(self):
         """Show how many ships are left."""
+        self.shown_ships_left = self.stats.ships_left
+        self.changed = True
         self.ships = Group()
         for ship_number in range(self.stats.ships_left):
             ship = Ship(self.ai_game)
@@ -74,6 +92,19 @@ class Scoreboard:
             ship.rect.y = 10
             self.ships.add(ship)
 
+    def prep_profile(self, lines):
+        """Turn lines of profiler output into images below the ships."""
+        self.profile_images = []
+        top = 70
+        for line in lines:
+            image = text_cache.render(self.profile_font, line,
+                                      self.text_color, self.settings.bg_color)
+            rect = image.get_rect()
+            rect.left, rect.top = 10, top
+            top = rect.bottom + 2
+            self.profile_images.append((image, rect))
+        self.changed = True
+
     def prep_images(self):
         # Prepare the initital score image.
         self.prep_score()
@@ -81,9 +112,38 @@ class Scoreboard:
         self.prep_level()
         self.prep_ships()
 
+    def check_stats(self):
+        """Re-prep any image whose statistic changed since it was drawn."""
+        if self.stats.score != self.shown_score:
+            self.prep_score()
+        if self.stats.high_score != self.shown_high_score:
+            self.prep_high_score()
+        if self.stats.level != self.shown_level:
+            self.prep_level()
+        if self.stats.ships_left != self.shown_ships_left:
+            self.prep_ships()
+
     def show_score(self):
         """Draw scores and level to the screen."""
         self.screen.blit(self.score_image, self.score_rect)
         self.screen.blit(self.high_score_image, self.high_score_rect)
         self.screen.blit(self.level_image, self.level_rect)
         self.ships.draw(self.screen)
+        if self.profile_images:
+            self.screen.blits(self.profile_images, doreturn=False)
+
+    def show_score_over(self, rects):
+        """
+        Redraw the parts of the scoreboard that overlap rects, and return
+        where they went.
+        """
+        images = [(self.score_image, self.score_rect),
+                  (self.high_score_image, self.high_score_rect),
+                  (self.level_image, self.level_rect)]
+        images.extend((ship.image, ship.rect) for ship in self.ships)
+        images.extend(self.profile_images)
+
+        overlapping = [(image, rect) for image, rect in images
+                       if rect.collidelist(rects) != -1]
+        self.screen.blits(overlapping, doreturn=False)
+        return [rect for image, rect in overlapping]
@@ -1,6 +1,7 @@
-import pygame
 from pygame.sprite import Sprite
 
+from assets import assets
+
 
 class Ship(Sprite):
     """A class to manage the ship."""
@@ -8,12 +9,12 @@ class Ship(Sprite):
     def __init__(self, ai_game):
         """Initialize the ship and set its starting position."""
         super().__init__()
-        self.screen = ai_game.screen
         self.settings = ai_game.settings
-        self.screen_rect = ai_game.screen.get_rect()
+        self.screen_rect = ai_game.screen_rect
 
-        # Load the ship image and get its rect.
-        self.image = pygame.image.load('images/ship.bmp')
+        # Get the shared ship image and its rect.
+        self.image = assets.get_image('images/ship.bmp')
+        self.mask = assets.get_mask('images/ship.bmp')
         self.rect = self.image.get_rect()
 
         # Start each new ship at the bottom center of the screen.
@@ -21,29 +22,32 @@ class Ship(Sprite):
 
         # Store a decimal value for the ship's horizontal position.
         self.x = float(self.rect.x)
+        self.prev_x = self.x
 
         # Movement flags
 
         self.moving_right = False
         self.moving_left = False
 
-    def update(self):
+    def update(self, dt=1):
         """Update the ship's position based on movement flags."""
         # Update the ship's x value, not the rect.
-
+        self.prev_x = self.x
         if self.moving_right and self.rect.right < self.screen_rect.right:
-            self.x += self.settings.ship_speed
+            self.x += self.settings.ship_speed * dt
         if self.moving_left and self.rect.left > 0:
-            self.x -= self.settings.ship_speed
+            self.x -= self.settings.ship_speed * dt
 
         # Update rect object from self.x.
         self.rect.x = self.x
 
-    def blitme(self):
-        """Draw the ship at its current location."""
-        self.screen.blit(self.image, self.rect)
+    def blitme(self, screen, alpha=1):
+        """Draw the ship alpha of the way between its last two positions."""
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        return screen.blit(self.image, (x, self.rect.y))
 
     def center_ship(self):
         """Center the ship on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
         self.x = float(self.rect.x)
+        self.prev_x = self.x
@@ -0,0 +1,190 @@
+import struct
+from time import perf_counter
+
+import numpy as np
+
+from game_state import GameState
+
+# A snapshot starts with a header of every single value in the game, then
+#  has the fleet and laser arrays as raw bytes.
+MAGIC = b'AISNP'
+VERSION = 1
+HEADER = struct.Struct(
+    '<5sB'
+    # Stats: ships_left, score, level, high_score, game_active, show_play.
+    'i16si16s?B'
+    # Dynamic settings: ship, laser and alien speed, fleet_direction,
+    #  speedup_scale, alien_points.
+    'dddbd16s'
+    # Engine: difficulty, ship_was_hit, state, time_left, next state.
+    'B?BdB'
+    # Ship: x, prev_x, rect.x, moving_right, moving_left.
+    'ddi??'
+    # Fleet: aliens, count, offset_y, left, right, top, bottom.
+    'IIddddd'
+    # Lasers: top, untouched free slots, other free slots.
+    'III')
+
+# The states a game can be in, by the code stored for each one.
+STATES = (GameState.MENU, GameState.PLAYING, GameState.RESPAWNING,
+          GameState.GAME_OVER)
+NO_STATE = 255
+
+# Scores and point values grow without limit, so they're stored in 16
+#  bytes.
+BIG_INT_BYTES = 16
+
+
+def _big(value):
+    """Return the bytes of an int too big for a struct field."""
+    return value.to_bytes(BIG_INT_BYTES, 'little', signed=True)
+
+
+def _unbig(data):
+    """Return the int stored by _big()."""
+    return int.from_bytes(data, 'little', signed=True)
+
+
+def take_snapshot(engine):
+    """Return the state of a game as a compact string of bytes."""
+    stats, settings, state = engine.stats, engine.settings, engine.state
+    ship, fleet, lasers = engine.ship, engine.aliens, engine.lasers
+
+    # Slots are handed out from the end of the free list, so it starts with
+    #  a run of slots that have never been used: size - 1, size - 2, ...
+    #  Only the length of that run is stored.
+    free = np.array(lasers.free, dtype=np.int32)
+    never_used = np.arange(lasers.size - 1, lasers.size - 1 - free.size, -1)
+    changed = np.flatnonzero(free != never_used)
+    untouched = changed[0] if changed.size else free.size
+
+    header = HEADER.pack(
+        MAGIC, VERSION,
+        stats.ships_left, _big(stats.score), stats.level,
+        _big(stats.high_score), stats.game_active, stats.show_play,
+        settings.ship_speed, settings.laser_speed, settings.alien_speed,
+        settings.fleet_direction, settings.speedup_scale,
+        _big(settings.alien_points),
+        list(settings.difficulties).index(engine.difficulty),
+        engine.ship_was_hit, STATES.index(state.name), state.time_left,
+        STATES.index(state.next_name) if state.next_name else NO_STATE,
+        ship.x, ship.prev_x, ship.rect.x, ship.moving_right,
+        ship.moving_left,
+        fleet.x.size, fleet.count, fleet.offset_y, fleet.left, fleet.right,
+        fleet.top, fleet.bottom,
+        lasers.top, untouched, free.size - untouched)
+
+    top = lasers.top
+    return b''.join((
+        header, fleet.x.tobytes(), fleet.y.tobytes(),
+        fleet.prev_x.tobytes(), fleet.alive.tobytes(),
+        lasers.x[:top].tobytes(), lasers.y[:top].tobytes(),
+        lasers.prev_y[:top].tobytes(), lasers.active[:top].tobytes(),
+        free[untouched:].tobytes()))
+
+
+def restore_snapshot(engine, data):
+    """Put a game back in the state stored in a snapshot."""
+    values = HEADER.unpack_from(data)
+    if values[:2] != (MAGIC, VERSION):
+        raise ValueError("That isn't an Alien Invasion snapshot.")
+    (stats_values, settings_values, engine_values, ship_values,
+     fleet_values, laser_values) = (
+        values[2:8], values[8:14], values[14:19], values[19:24],
+        values[24:31], values[31:])
+
+    stats = engine.stats
+    (stats.ships_left, score, stats.level, high_score, stats.game_active,
+     stats.show_play) = stats_values
+    stats.score, stats.high_score = _unbig(score), _unbig(high_score)
+
+    settings = engine.settings
+    (settings.ship_speed, settings.laser_speed, settings.alien_speed,
+     settings.fleet_direction, settings.speedup_scale,
+     alien_points) = settings_values
+    settings.alien_points = _unbig(alien_points)
+
+    difficulty, engine.ship_was_hit, name, time_left, next_name = (
+        engine_values)
+    engine.difficulty = list(settings.difficulties)[difficulty]
+    engine.state.set(STATES[name], time_left,
+                     STATES[next_name] if next_name != NO_STATE else None)
+
+    ship = engine.ship
+    ship.x, ship.prev_x, ship.rect.x, ship.moving_right, ship.moving_left = (
+        ship_values)
+
+    # Read each array back from where it sits after the header.
+    offset = HEADER.size
+
+    def read(dtype, count):
+        nonlocal offset
+        array = np.frombuffer(data, dtype, count, offset).copy()
+        offset += array.nbytes
+        return array
+
+    fleet = engine.aliens
+    aliens, fleet.count, fleet.offset_y = fleet_values[:3]
+    fleet.left, fleet.right, fleet.top, fleet.bottom = fleet_values[3:]
+    fleet.x, fleet.y = read(float, aliens), read(float, aliens)
+    fleet.prev_x, fleet.alive = read(float, aliens), read(bool, aliens)
+    # The fleet is sorted by where its rows started, before any drops.
+    fleet.sweep.build(fleet.y - fleet.offset_y, fleet.height)
+
+    lasers = engine.lasers
+    top, untouched, other_free = laser_values
+    lasers.active[:] = False
+    lasers.top = top
+    lasers.x[:top], lasers.y[:top] = read(float, top), read(float, top)
+    lasers.prev_y[:top], lasers.active[:top] = (read(float, top),
+                                                read(bool, top))
+    lasers.free = (list(range(lasers.size - 1, lasers.size - 1 - untouched,
+                              -1))
+                   + read(np.int32, other_free).tolist())
+
+
+if __name__ == '__main__':
+    # Time snapshots of a game in progress, then play many games on from
+    #  one snapshot to compare two policies.
+    import random
+
+    from settings import Settings
+    from game_engine import GameEngine, chase_policy
+    from batch_runner import random_policy
+
+    settings = Settings()
+    settings.score_file = None
+    engine = GameEngine(settings)
+    engine.start_game('medium')
+    dt = settings.reference_fps / settings.tick_rate
+    for tick in range(300):
+        chase_policy(engine)
+        engine.update(dt)
+
+    data = take_snapshot(engine)
+    start = perf_counter()
+    for repeat in range(1000):
+        take_snapshot(engine)
+    take_time = (perf_counter() - start) / 1000
+    start = perf_counter()
+    for repeat in range(1000):
+        restore_snapshot(engine, data)
+    restore_time = (perf_counter() - start) / 1000
+    print(f"{len(data)} bytes, {len(engine.aliens)} aliens, "
+          f"{len(engine.lasers)} lasers: take {take_time * 1e6:.1f} us, "
+          f"restore {restore_time * 1e6:.1f} us")
+
+    for name in ('chase', 'random'):
+        scores = []
+        for rollout in range(20):
+            restore_snapshot(engine, data)
+            policy = (chase_policy if name == 'chase'
+                      else random_policy(random.Random(rollout)))
+            for tick in range(2000):
+                if not engine.stats.game_active:
+                    break
+                policy(engine)
+                engine.update(dt)
+            scores.append(engine.stats.score)
+        print(f"{name}: mean score {sum(scores) / len(scores):,.0f} "
+              f"over {len(scores)} rollouts")
@@ -0,0 +1,87 @@
+from time import perf_counter
+from types import SimpleNamespace
+
+import numpy as np
+import pygame
+
+
+class Starfield:
+    """A class to draw thousands of falling stars as a parallax background."""
+
+    def __init__(self, ai_game, count=20_000, layers=3, speed=0.5,
+                 seed=None):
+        """
+        Scatter count stars over the screen in layers. Stars in nearer
+        layers fall faster and shine brighter.
+        """
+        self.screen_rect = ai_game.screen.get_rect()
+        self.layers = layers
+        rng = np.random.default_rng(seed)
+
+        # Sort the stars from far to near, so near stars are drawn on top.
+        self.layer = np.sort(rng.integers(0, layers, count))
+        depth = (self.layer + 1) / layers
+        self.speed = speed * depth * rng.uniform(0.8, 1.2, count)
+
+        # Stars only fall, so each one stays in its own column.
+        self.x = rng.integers(0, self.screen_rect.width, count)
+        self.y = rng.uniform(0, self.screen_rect.height, count)
+
+        # The color of each layer, mapped to the pixel format of the screen
+        #  the first time the stars are drawn.
+        self.colors = [(level, level, level) for level
+                       in np.linspace(90, 255, layers).astype(int).tolist()]
+        self.pixel_colors = None
+
+        # Stars before first are hidden, to save time on slow machines.
+        self.first = 0
+
+    def __len__(self):
+        """Return the number of stars."""
+        return self.x.size
+
+    def show(self, share):
+        """Show only share of the stars, hiding the farthest ones first."""
+        self.first = int(len(self) * (1 - share))
+
+    def showing(self):
+        """Return whether any stars are shown."""
+        return self.first < len(self)
+
+    def update(self, dt=1):
+        """Move every star down, and wrap fallen stars back to the top."""
+        y = self.y[self.first:]
+        y += self.speed[self.first:] * dt
+        np.remainder(y, self.screen_rect.height, out=y)
+
+    def draw(self, screen):
+        """Write each star straight into the screen's pixels."""
+        if self.pixel_colors is None:
+            layer_colors = np.array([screen.map_rgb(color)
+                                     for color in self.colors])
+            self.pixel_colors = layer_colors[self.layer]
+
+        first = self.first
+        pixels = pygame.surfarray.pixels2d(screen)
+        pixels[self.x[first:], self.y[first:].astype(int)] = (
+            self.pixel_colors[first:])
+
+        # The screen stays locked until the pixel array is let go.
+        del pixels
+        return self.screen_rect
+
+
+if __name__ == '__main__':
+    # Time how long a large starfield takes to update and draw.
+    pygame.init()
+    screen = pygame.display.set_mode((1200, 800))
+    scene = SimpleNamespace(screen=screen)
+
+    for count in (20_000, 100_000):
+        starfield = Starfield(scene, count, seed=1)
+        start = perf_counter()
+        for frame in range(200):
+            starfield.update()
+            starfield.draw(screen)
+        seconds = (perf_counter() - start) / 200
+        print(f"{count:,} stars: {seconds * 1000:.2f} ms per frame")
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+
+import pygame.font
+
+# pygame's own bundled font. Loading it by file skips the search through
+#  every font installed on the system that SysFont does.
+FONT_FILE = None
+
+
+class TextCache:
+    """A class to keep recently rendered text images for reuse."""
+
+    def __init__(self, max_images=64):
+        """Initialize an empty cache holding up to max_images images."""
+        self.max_images = max_images
+        self.images = OrderedDict()
+        self.fonts = {}
+
+        # Statistics so we can see how often rendering is skipped.
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size=48):
+        """Return the one shared font of the given size."""
+        font = self.fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(FONT_FILE, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, font, text, color, background=None):
+        """Return an image of text, rendering it only if it isn't cached."""
+        key = (font, text, color, background)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            self.images.move_to_end(key)
+            return image
+
+        self.misses += 1
+        image = font.render(text, True, color, background)
+        self.images[key] = image
+
+        # Forget the least recently used image once the cache is full.
+        if len(self.images) > self.max_images:
+            self.images.popitem(last=False)
+        return image
+
+    def report(self):
+        """Return a short summary of cache hits and misses."""
+        return (f"Text images cached: {len(self.images)}, "
+                f"hits: {self.hits}, misses: {self.misses}")
+
+
+# The one text cache shared by the scoreboard and buttons.
+text_cache = TextCache()
@@ -0,0 +1,52 @@
+import pygame
+
+
+class FixedTimestep:
+    """
+    A class to advance a game in fixed ticks, however long its frames take.
+    The main game and the scenes both run their loops with it.
+    """
+
+    def __init__(self, settings):
+        """Start with no time waiting to be simulated."""
+        self.clock = pygame.time.Clock()
+        self.tick_time = 1 / settings.tick_rate
+        # How many reference frames of movement one tick covers.
+        self.tick_dt = settings.reference_fps / settings.tick_rate
+        self.lag = 0.0
+
+        # Every tick run and dropped so far.
+        self.ticks = 0
+        self.dropped_ticks = 0
+
+    def wait(self, fps):
+        """Wait for the next frame at fps, and return the seconds it took."""
+        seconds = self.clock.tick(fps) / 1000
+        self.lag += seconds
+        return seconds
+
+    def catch_up(self, tick, max_ticks):
+        """
+        Call tick(dt) for each whole tick since the last frame, up to
+        max_ticks times. Drop the rest, instead of falling further behind
+        every frame. Return how many ticks ran and how many were dropped.
+        """
+        ticks = 0
+        while self.lag >= self.tick_time and ticks < max_ticks:
+            tick(self.tick_dt)
+            self.lag -= self.tick_time
+            ticks += 1
+
+        dropped = 0
+        if self.lag >= self.tick_time:
+            dropped = int(self.lag / self.tick_time)
+            self.lag -= dropped * self.tick_time
+
+        self.ticks += ticks
+        self.dropped_ticks += dropped
+        return ticks, dropped
+
+    @property
+    def alpha(self):
+        """Return how far the game is between the last tick and the next."""
+        return self.lag / self.tick_time
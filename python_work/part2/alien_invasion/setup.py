@@ -10,7 +10,7 @@ config = {
     'download_url': 'Where to download it.',
     'author_email': 'sicou2@gmail.com',
     'version': '0.1',
-    'install_requires': ['pytest', 'pygame'],
+    'install_requires': ['pytest', 'pygame', 'numpy'],
     'packages': ['alien_invasion'],
     'scripts': ['alien_invasion/alien_invasion'],
     'name': 'alien_invastion_game',
@@ -1,12 +1,869 @@
-from pytest import *
-import alien_invasion
-
-def setup():
-    print("SETUP!")
-    
-def teardown():
-    print("TEAR DOWN!")
-    
-def test_basic():
-    print("I RAN!")
-    
\ No newline at end of file
+"""
+Benchmarks for Alien Invasion.
+
+Each benchmark times a scripted scenario. Set
+ALIEN_INVASION_UPDATE_BASELINE=1 to store the times in
+benchmark_baseline.json, which stays on that machine. Set
+ALIEN_INVASION_CHECK_BASELINE=1 to fail a benchmark that runs more than
+ALIEN_INVASION_BENCH_TOLERANCE (default 2.0) times slower than its
+stored baseline, or misses its own time limit. Run pytest with -s to see
+the timings.
+"""
+import json
+import os
+from time import perf_counter
+
+import pytest
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'benchmark_baseline.json')
+TOLERANCE = float(os.environ.get('ALIEN_INVASION_BENCH_TOLERANCE', 2.0))
+UPDATE_BASELINE = os.environ.get('ALIEN_INVASION_UPDATE_BASELINE') == '1'
+CHECK_BASELINE = os.environ.get('ALIEN_INVASION_CHECK_BASELINE') == '1'
+
+
+@pytest.fixture(scope='module')
+def baseline():
+    """Load the stored baseline, and save it again if asked to."""
+    try:
+        with open(BASELINE_FILE) as f:
+            times = json.load(f)
+    except FileNotFoundError:
+        times = {}
+    yield times
+    if UPDATE_BASELINE:
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(times, f, indent=4, sort_keys=True)
+            f.write('\n')
+
+
+def make_settings():
+    """Return default settings that keep scores in memory only."""
+    from settings import Settings
+
+    # Benchmarks stay off the player's leaderboards.
+    settings = Settings()
+    settings.score_file = None
+    return settings
+
+
+@pytest.fixture
+def settings():
+    """Make settings for a game whose scores aren't saved."""
+    return make_settings()
+
+
+@pytest.fixture
+def ai_game(settings):
+    """Make a game that has just started at medium difficulty."""
+    from alien_invasion.alien_invasion import AlienInvasion
+
+    ai_game = AlienInvasion(settings)
+    ai_game.difficulty = 'medium'
+    ai_game._start_game()
+    return ai_game
+
+
+def run_benchmark(baseline, name, function, calls, rounds=5):
+    """
+    Time calls calls of function, check it against the baseline, and
+    return the seconds per call.
+    """
+    # Use the fastest round, as it is the least disturbed by other work.
+    best = min(_time_round(function, calls) for _ in range(rounds))
+    per_call = best / calls
+    print(f"\n{name}: {per_call * 1000:.3f} ms per call, "
+          f"{1 / per_call:,.0f} calls/sec")
+    check_baseline(baseline, name, per_call)
+    return per_call
+
+
+def check_baseline(baseline, name, per_call):
+    """Store a time per call as the baseline, or check it against it."""
+    if UPDATE_BASELINE:
+        baseline[name] = per_call
+        return
+    if not CHECK_BASELINE or name not in baseline:
+        return
+    limit = baseline[name] * TOLERANCE
+    assert per_call <= limit, (
+        f"{name} regressed: {per_call * 1000:.3f} ms per call, baseline "
+        f"{baseline[name] * 1000:.3f} ms")
+
+
+def check_limit(name, seconds, limit):
+    """Check a time against a fixed limit, if baseline checks are on."""
+    if CHECK_BASELINE:
+        assert seconds < limit, (
+            f"{name} took {seconds * 1000:.3f} ms, over its limit of "
+            f"{limit * 1000:.3f} ms")
+
+
+def _time_round(function, calls):
+    """Return the seconds taken to call function calls times."""
+    start = perf_counter()
+    for _ in range(calls):
+        function()
+    return perf_counter() - start
+
+
+def test_startup(baseline, settings):
+    """Start the game and draw its first frame."""
+    import pygame
+    from alien_invasion.alien_invasion import AlienInvasion
+
+    games = []
+
+    def start_up():
+        ai_game = AlienInvasion(settings, startup_trace=True)
+        ai_game._update_screen()
+        ai_game.startup.lap('first frame')
+        games.append(ai_game)
+
+    run_benchmark(baseline, 'startup', start_up, calls=10)
+
+    steps = [step for step, seconds in games[0].startup.steps]
+    assert steps == ['pygame display and font', 'window', 'game engine',
+                     'scoreboard', 'buttons', 'quality', 'first frame']
+
+    # Only the parts of pygame the game uses are started.
+    assert pygame.display.get_init() and pygame.font.get_init()
+    assert not pygame.mixer.get_init()
+    assert not pygame.joystick.get_init()
+
+
+def test_asset_cache():
+    """Check that an image is read from disk once, then shared."""
+    from assets import AssetCache
+
+    cache = AssetCache()
+    image = cache.get_image('images/alien.bmp')
+    assert cache.get_image('images/alien.bmp') is image
+    assert (cache.loads, cache.hits) == (1, 1)
+    assert cache.report().startswith("Images loaded: 1, cache hits: 1")
+
+
+def test_text_cache():
+    """Check that the same text is rendered once, then reused."""
+    from text_cache import TextCache
+
+    cache = TextCache()
+    font = cache.get_font(24)
+    image = cache.render(font, "1,000", (30, 30, 30))
+    assert cache.render(font, "1,000", (30, 30, 30)) is image
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.report().endswith("hits: 1, misses: 1")
+
+
+def test_profiler_toggle():
+    """Check that turning the profiler back on starts from a clean frame."""
+    from profiler import FrameProfiler
+
+    profiler = FrameProfiler(enabled=True)
+    profiler.start_frame()
+    profiler.lap('_update_screen')
+    profiler.toggle()
+    profiler.toggle()
+    assert not any(profiler.frame.values())
+
+
+def test_fleet_creation(baseline, ai_game):
+    """Build a full fleet of aliens."""
+    run_benchmark(baseline, 'fleet_creation', ai_game.engine._create_fleet,
+                  calls=200)
+
+
+def test_laser_stress(baseline, ai_game):
+    """Update the game with 1000 lasers in the air."""
+    engine = ai_game.engine
+    engine.settings.lasers_allowed = 1000
+    engine.settings.laser_width = 3
+
+    # Fire lasers from all along the bottom of the screen.
+    for shot in range(1000):
+        engine.ship.x = shot % engine.settings.screen_width
+        engine.ship.rect.x = engine.ship.x
+        engine.fire_laser()
+    assert len(engine.lasers) == 1000
+
+    # Slow the lasers down, so they're all still flying in the last round.
+    engine.settings.laser_speed = 0.5
+    dt = engine.settings.reference_fps / engine.settings.tick_rate
+    run_benchmark(baseline, 'laser_stress_tick', lambda: engine.update(dt),
+                  calls=100)
+    assert len(engine.lasers) == 1000
+
+
+def test_mask_collisions(baseline):
+    """
+    Time rect and pixel-perfect collisions with a full fleet and 1000
+    lasers, and check that pixel-perfect collisions cost no more than 10%
+    over rect collisions, and only count solid pixels.
+    """
+    import numpy as np
+    from game_engine import GameEngine
+
+    def stress_round(mask_collisions):
+        settings = make_settings()
+        settings.mask_collisions = mask_collisions
+        settings.lasers_allowed = 1000
+        settings.laser_width = 3
+        engine = GameEngine(settings)
+        engine.start_game('medium')
+        for shot in range(1000):
+            engine.ship.x = shot % settings.screen_width
+            engine.ship.rect.x = engine.ship.x
+            engine.fire_laser()
+
+        # Time each tick as the lasers fly up through the whole fleet.
+        dt = settings.reference_fps / settings.tick_rate
+        return [_time_round(lambda: engine.update(dt), 1)
+                for tick in range(120)]
+
+    # Take turns, so both see the same machine load.
+    times = {False: [], True: []}
+    for round in range(30):
+        for mask_collisions in times:
+            times[mask_collisions].append(stress_round(mask_collisions))
+
+    # Every round plays out the same, so the fastest time for each tick is
+    #  the one least disturbed by other work.
+    rect_time, mask_time = (sum(map(min, zip(*times[mask_collisions]))) / 120
+                            for mask_collisions in times)
+    print(f"\nrect collisions: {rect_time * 1000:.3f} ms per tick, "
+          f"mask collisions: {mask_time * 1000:.3f} ms per tick")
+    check_baseline(baseline, 'laser_stress_rect_collisions', rect_time)
+    check_baseline(baseline, 'laser_stress_mask_collisions', mask_time)
+    assert mask_time <= rect_time * 1.1
+
+    # A laser over the alien's see-through top left corner only hits it
+    #  when rects are compared; one over its middle hits it either way.
+    engine = GameEngine(make_settings())
+    engine.start_game('medium')
+    fleet = engine.aliens
+    for left, top, hit_by_mask in ((0, 0, False), (28, 28, True)):
+        x, y = np.array([fleet.x[0] + left]), np.array([fleet.y[0] + top])
+        assert fleet.collide_rects(x, y, 3, 5)[1].tolist() == [0]
+        hits = fleet.collide_rects(x, y, 3, 5, pixel_perfect=True)[1]
+        assert hits.tolist() == ([0] if hit_by_mask else [])
+
+    # The alien's summed-area table is built once and shared, like its mask.
+    fleets = [GameEngine(make_settings()).aliens for fleet in range(2)]
+    assert fleets[0].solid_sums is fleets[1].solid_sums
+
+
+def test_ship_mask_collisions():
+    """
+    Check that with pixel-perfect collisions, an alien only hits the ship
+    when their solid pixels touch.
+    """
+    from game_engine import GameEngine
+
+    # The ship's see-through bottom left corner over the alien's see-through
+    #  top right corner only hits it when rects are compared; the ship over
+    #  the alien's middle hits it either way.
+    for mask_collisions in (False, True):
+        for left, bottom, hit in ((56, 4, not mask_collisions),
+                                  (0, 40, True)):
+            settings = make_settings()
+            settings.mask_collisions = mask_collisions
+            engine = GameEngine(settings)
+            engine.start_game('medium')
+            fleet = engine.aliens
+            engine.ship.rect.bottomleft = (int(fleet.x[0]) + left,
+                                           int(fleet.y[0]) + bottom)
+            engine._update_aliens(0)
+            assert engine.ship_was_hit == hit
+
+
+def test_rapid_fire(baseline, ai_game):
+    """Update the game in stress mode, firing 20 lasers every tick."""
+    engine = ai_game.engine
+    engine.settings.stress_shots_per_tick = 20
+
+    dt = engine.settings.reference_fps / engine.settings.tick_rate
+    for tick in range(10):
+        engine.update(dt)
+    assert len(engine.lasers) == 200
+
+    run_benchmark(baseline, 'rapid_fire_tick', lambda: engine.update(dt),
+                  calls=200, rounds=3)
+
+
+def test_level_up(baseline, ai_game):
+    """Clear 50 fleets in a row, speeding the game up each time."""
+    engine = ai_game.engine
+
+    def level_up():
+        engine.settings.initialize_dynamic_settings('medium')
+        for level in range(50):
+            engine.aliens.kill(slice(None))
+            engine._start_new_level()
+
+    run_benchmark(baseline, 'level_up_50', level_up, calls=5)
+
+
+def test_scoreboard_prep(baseline, ai_game):
+    """Re-prep the scoreboard after the score changes."""
+    stats, sb = ai_game.stats, ai_game.sb
+
+    def score_points():
+        stats.score += 50
+        sb.check_stats()
+
+    run_benchmark(baseline, 'scoreboard_prep', score_points, calls=500)
+
+
+def test_score_saving(baseline, tmp_path):
+    """Record finished games, which are written to disk in the background."""
+    from score_store import ScoreStore
+
+    scores = ScoreStore(tmp_path / 'high_scores.db')
+    points = iter(range(1, 10**6))
+    run_benchmark(baseline, 'score_save',
+                  lambda: scores.add_score('medium', next(points), 1),
+                  calls=200)
+    scores.close()
+
+    # Every score reached the file, and the best ones come back in order.
+    saved = ScoreStore(tmp_path / 'high_scores.db', size=3)
+    assert saved.leaderboard('medium') == [(1000, 1), (999, 1), (998, 1)]
+    assert saved.high_score('hard') == 0
+
+
+def test_replay(baseline, ai_game, tmp_path):
+    """Replay a recorded game of 2000 ticks, without drawing it."""
+    import pygame
+    from alien_invasion.alien_invasion import AlienInvasion
+    from input_recording import InputRecorder, Recording
+
+    # Click Play and Medium, then sweep right and left, firing as we go.
+    recorder = InputRecorder(tmp_path / 'game.airec', seed=1)
+    play, medium = ai_game.game_buttons[0], ai_game.game_buttons[2]
+    recorder.record(0, pygame.event.Event(
+        pygame.MOUSEBUTTONDOWN, button=1, pos=play.rect.center))
+    recorder.record(1, pygame.event.Event(
+        pygame.MOUSEBUTTONDOWN, button=1, pos=medium.rect.center))
+    for tick in range(2, 2000, 200):
+        key = pygame.K_RIGHT if tick % 400 == 2 else pygame.K_LEFT
+        recorder.record(tick, pygame.event.Event(pygame.KEYDOWN, key=key))
+        recorder.record(tick + 190, pygame.event.Event(pygame.KEYUP, key=key))
+    for tick in range(2, 2000, 15):
+        recorder.record(tick, pygame.event.Event(pygame.KEYDOWN,
+                                                 key=pygame.K_SPACE))
+    recorder.save(2000)
+
+    recording = Recording(tmp_path / 'game.airec')
+    results = []
+
+    def replay():
+        replay_game = AlienInvasion(make_settings())
+        replay_game.replay(recording)
+        results.append((replay_game.stats.score, replay_game.stats.level,
+                        replay_game.stats.ships_left))
+
+    run_benchmark(baseline, 'replay_2000_ticks', replay, calls=1, rounds=3)
+
+    # Every replay of the recording plays out the same way.
+    assert results[0][0] > 0
+    assert results.count(results[0]) == len(results)
+
+
+def test_replay_skips_snapshots(settings, tmp_path):
+    """Check that a replay neither saves nor loads the snapshot file."""
+    import pygame
+    from alien_invasion.alien_invasion import AlienInvasion
+    from input_recording import InputRecorder, Recording
+
+    settings.snapshot_file = str(tmp_path / 'quicksave.snap')
+    with open(settings.snapshot_file, 'wb') as f:
+        f.write(b'the player\'s quicksave')
+
+    recorder = InputRecorder(tmp_path / 'game.airec', seed=1)
+    for tick, key in ((10, pygame.K_F5), (20, pygame.K_F9)):
+        recorder.record(tick, pygame.event.Event(pygame.KEYDOWN, key=key))
+    recorder.save(30)
+
+    AlienInvasion(settings).replay(Recording(tmp_path / 'game.airec'))
+    with open(settings.snapshot_file, 'rb') as f:
+        assert f.read() == b'the player\'s quicksave'
+
+
+def test_snapshot_file(settings, tmp_path, monkeypatch, game_dir):
+    """Check the snapshot is saved next to the game, wherever it's run."""
+    from alien_invasion.alien_invasion import AlienInvasion
+
+    settings.snapshot_file = 'test_quicksave.snap'
+    path = os.path.join(game_dir, settings.snapshot_file)
+    ai_game = AlienInvasion(settings)
+    monkeypatch.chdir(tmp_path)
+    try:
+        ai_game._save_snapshot()
+        assert os.path.exists(path)
+        assert not os.path.exists(settings.snapshot_file)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@pytest.mark.parametrize('capture_file', ['session.frames', 'frames'])
+def test_frame_capture(baseline, ai_game, tmp_path, capture_file):
+    """
+    Time capturing frames, as a frame log or as PNG images, and check that
+    every frame is written and saved exactly. With baseline checks on,
+    each capture must take under a millisecond.
+    """
+    from time import sleep
+    from zlib import crc32
+
+    import pygame
+    from frame_recorder import FrameRecorder, read_frame_log
+
+    def checksum(surface):
+        return crc32(pygame.surfarray.array3d(surface).tobytes())
+
+    path = str(tmp_path / capture_file)
+    recorder = FrameRecorder(ai_game.screen, path, buffer_frames=8)
+    captured = {}
+    capture_time = 0
+    for frame in range(50):
+        ai_game.engine.update(2)
+        ai_game._update_screen()
+        capture_time += _time_round(recorder.capture, 1)
+        captured[recorder.frames - 1] = checksum(ai_game.screen)
+        # Leave the encoder about as long as a frame at 60 fps would.
+        sleep(0.015)
+    print(f"\n{capture_file}: {capture_time / 50 * 1000:.3f} ms per "
+          f"capture, {recorder.dropped} dropped")
+    name = ('frame_capture_log' if capture_file.endswith('.frames')
+            else 'frame_capture_png')
+    check_baseline(baseline, name, capture_time / 50)
+    check_limit(name, capture_time / 50, 0.001)
+
+    # Frames that come faster than they can be written are dropped.
+    ai_game.engine.update(2)
+    ai_game._update_screen()
+    last = checksum(ai_game.screen)
+    for frame in range(20):
+        recorder.capture()
+        captured[recorder.frames - 1] = last
+    assert recorder.dropped
+
+    # A blocking capture waits for room instead.
+    dropped = recorder.dropped
+    recorder.capture(block=True)
+    captured[recorder.frames - 1] = last
+    assert recorder.dropped == dropped
+
+    # Closing waits for every frame in the ring to be written.
+    recorder.close()
+    assert recorder.written == recorder.frames - recorder.dropped
+    assert recorder.filled.empty()
+    assert recorder.free.qsize() == 8
+
+    if capture_file.endswith('.frames'):
+        frames = list(read_frame_log(path))
+    else:
+        frames = [(int(name[6:12]),
+                   pygame.image.load(os.path.join(path, name)))
+                  for name in sorted(os.listdir(path))]
+    assert len(frames) == recorder.written
+    for number, frame in frames:
+        assert checksum(frame) == captured[number]
+
+
+def test_simulation_thread(baseline):
+    """
+    Play 60 frames with a slow flip, in one thread and with the simulation
+    on its own thread, and compare the input latency and tick jitter.
+    Ticks on their own thread jitter less than half as much.
+    """
+    from time import sleep
+
+    import pygame
+    from alien_invasion.alien_invasion import AlienInvasion
+
+    jitter = {}
+    for threaded in (False, True):
+        settings = make_settings()
+        settings.adaptive_quality = False
+        settings.threaded_simulation = threaded
+        ai_game = AlienInvasion(settings)
+        ai_game.difficulty = 'medium'
+        ai_game._start_game()
+
+        # Flip like a display waiting for vsync, and fire every 4 frames.
+        show_frame = ai_game._show_frame
+
+        def slow_show_frame(rects=None):
+            show_frame(rects)
+            sleep(0.012)
+            if ai_game.stats.frames % 4 == 0:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN,
+                                                     key=pygame.K_SPACE))
+
+        ai_game._show_frame = slow_show_frame
+        ai_game.run_game(max_frames=60)
+
+        latency = ai_game.latency
+        p50, p95, p99 = latency.latency_percentiles()
+        jitter[threaded] = latency.tick_jitter()
+        print(f"\nthreaded={threaded}: input to screen {p50:.2f} / "
+              f"{p95:.2f} / {p99:.2f} ms, tick jitter "
+              f"{jitter[threaded]:.2f} ms")
+        assert len(latency.latencies) >= 10
+        assert len(ai_game.view.lasers)
+        assert not ai_game.simulating
+
+    # Ticks on their own thread keep to the tick rate through the flips.
+    check_baseline(baseline, 'threaded_tick_jitter', jitter[True] / 1000)
+    assert jitter[True] < jitter[False] / 2
+
+
+def test_simulation_thread_error(settings):
+    """Check that an error in the simulation thread stops the game loop."""
+    from alien_invasion.alien_invasion import AlienInvasion
+
+    settings.threaded_simulation = True
+    ai_game = AlienInvasion(settings)
+
+    def failing_update(dt):
+        raise ValueError("the simulation broke")
+
+    ai_game.engine.update = failing_update
+    with pytest.raises(ValueError, match="the simulation broke"):
+        ai_game.run_game(max_frames=60)
+    assert not ai_game.simulating
+    assert ai_game.stats.frames < 60
+
+
+def test_snapshot(baseline, settings):
+    """
+    Take and restore a snapshot of a game with a full fleet, and check the
+    state comes back the same. With baseline checks on, the round trip
+    must take well under a millisecond.
+    """
+    from game_engine import GameEngine, chase_policy
+    from snapshot import take_snapshot, restore_snapshot
+
+    engine = GameEngine(settings)
+    engine.start_game('medium')
+    dt = settings.reference_fps / settings.tick_rate
+
+    def play(ticks):
+        for tick in range(ticks):
+            chase_policy(engine)
+            engine.update(dt)
+
+    play(20)
+    data = take_snapshot(engine)
+    round_trip = run_benchmark(
+        baseline, 'snapshot_round_trip',
+        lambda: restore_snapshot(engine, take_snapshot(engine)), calls=1000)
+    check_limit('snapshot_round_trip', round_trip, 0.001)
+
+    # Restoring a snapshot brings back exactly the state it was taken from.
+    assert take_snapshot(engine) == data
+
+    # Games played on from a snapshot play out the same as the original.
+    play(500)
+    expected = take_snapshot(engine)
+    for branch in range(2):
+        restore_snapshot(engine, data)
+        play(500)
+        assert take_snapshot(engine) == expected
+
+
+def test_starfield(baseline, ai_game):
+    """Move and draw a background of 20,000 stars."""
+    from starfield import Starfield
+
+    starfield = Starfield(ai_game, 20_000, seed=1)
+
+    def starfield_frame():
+        starfield.update()
+        starfield.draw(ai_game.screen)
+
+    run_benchmark(baseline, 'starfield_20000', starfield_frame, calls=100)
+
+
+def test_world_systems(baseline, ai_game):
+    """Move, cull, collide and draw 2,000 entities in a world."""
+    import numpy as np
+
+    import ecs
+
+    world = ecs.World()
+    world.add_image(ai_game.engine.aliens.image)
+    rng = np.random.default_rng(1)
+    world.spawn(0, rng.uniform(0, 1200, 2000), rng.uniform(0, 800, 2000),
+                60, 58, vy=0.01)
+    world.spawn(1, rng.uniform(0, 1200, 100), rng.uniform(0, 800, 100),
+                3, 15, vy=-0.01)
+    world.colors[1] = (60, 60, 60)
+
+    # The sweep finds the same pairs as testing every pair.
+    a, b = ecs.collide(world, 1, 0)
+    lasers, aliens = world.find(1), world.find(0)
+    x, y = world.x, world.y
+    overlap = ((x[lasers, None] < x[aliens] + 60)
+               & (x[aliens] < x[lasers, None] + 3)
+               & (y[lasers, None] < y[aliens] + 58)
+               & (y[aliens] < y[lasers, None] + 15))
+    assert (sorted(zip(a.tolist(), b.tolist()))
+            == sorted((lasers[i], aliens[j])
+                      for i, j in zip(*np.nonzero(overlap))))
+
+    def world_tick():
+        ecs.move(world)
+        ecs.cull(world, ai_game.screen_rect)
+        ecs.collide(world, 1, 0)
+        ecs.render(world, ai_game.screen, [0, 1])
+
+    run_benchmark(baseline, 'world_2000_entities', world_tick, calls=20)
+
+
+def test_tuning_game(baseline):
+    """Play a seeded tuning game, which plays out the same every time."""
+    import batch_runner
+
+    batch_runner._start_worker()
+    job = {'difficulty': 'medium', 'speedup': 2.2, 'score_scale': 1.5,
+           'drop_speed': 10, 'policy': 'random', 'game': 0,
+           'max_ticks': 2000, 'seed': 12345}
+    results = []
+    run_benchmark(baseline, 'tuning_game_2000_ticks',
+                  lambda: results.append(batch_runner.play_tuning_game(job)),
+                  calls=1, rounds=3)
+    assert results.count(results[0]) == len(results)
+
+
+def test_environment(baseline):
+    """Step 16 games in lockstep with random actions."""
+    import numpy as np
+
+    from environment import ACTIONS, AlienInvasionEnv, VectorEnv
+
+    env = AlienInvasionEnv(observation='screen')
+    assert env.reset().shape == (100, 150)
+
+    actions = np.random.default_rng(1).integers(0, len(ACTIONS), (200, 16))
+    envs = VectorEnv(16)
+    first = envs.reset()
+    steps = iter(actions)
+    per_step = run_benchmark(baseline, 'environment_16_games_step',
+                             lambda: envs.step(next(steps)), calls=40)
+
+    # Games are stepped at tens of thousands of steps a second.
+    check_limit('environment_16_games_step', per_step, 16 / 10_000)
+
+    # Games spread over worker processes play out the same, and games cut
+    #  short start again.
+    results = []
+    for workers in (0, 2):
+        envs = VectorEnv(16, workers=workers, max_steps=150)
+        assert (envs.reset() == first).all()
+        for step_actions in actions:
+            observations, rewards, dones, infos = envs.step(step_actions)
+            if step_actions is actions[149]:
+                assert dones.all()
+        envs.close()
+        results.append((observations, rewards, dones))
+    for in_process, in_workers in zip(*results):
+        assert (in_process == in_workers).all()
+
+
+def test_environment_settings(settings):
+    """
+    Check that games made from the same settings play out on their own,
+    the same as games made from settings of their own.
+    """
+    import numpy as np
+
+    from environment import ACTIONS, AlienInvasionEnv, VectorEnv
+
+    envs = VectorEnv(4, settings=settings)
+    apart = [AlienInvasionEnv(settings=make_settings()) for env in range(4)]
+    assert (envs.reset() == [env.reset() for env in apart]).all()
+
+    actions = np.random.default_rng(1).integers(0, len(ACTIONS), (300, 4))
+    for step_actions in actions:
+        observations, rewards, dones, infos = envs.step(step_actions)
+        for env, action, observation, reward in zip(
+                apart, step_actions, observations, rewards):
+            expected, expected_reward, done, info = env.step(action)
+            if done:
+                expected = env.reset()
+            assert (observation == expected).all()
+            assert reward == expected_reward
+
+
+def test_quality_controller(settings):
+    """
+    Feed the quality controller made-up frame times, and check it steps
+    down when frames run long and back up when there's room to spare.
+    """
+    from quality import QualityController
+
+    quality = QualityController(settings.quality_tiers, target_fps=50)
+    slow, fast, steady = 0.02 * 0.95, 0.02 * 0.45, 0.02 * 0.7
+
+    def feed(frame_time, frames):
+        return [quality.update(frame_time) for frame in range(frames)]
+
+    # Nothing changes until a whole window of 30 frames has been seen.
+    assert feed(slow, 29) == [False] * 29
+    assert quality.tier == 0
+    assert feed(slow, 1) == [True]
+    assert quality.tier == 1
+
+    # Each step down waits for a new window, and stops at the last tier.
+    assert feed(slow, 30) == [False] * 29 + [True]
+    assert quality.name == 'low'
+    assert not any(feed(slow, 60))
+    assert quality.tier == 2
+
+    # Frames between half and 0.9 of the budget keep the tier.
+    assert not any(feed(steady, 60))
+    assert quality.tier == 2
+
+    # Fast frames step back up once the window's average falls below half
+    #  the budget, one window at a time, and stop at the top.
+    assert any(feed(fast, 30))
+    assert quality.tier == 1
+    assert any(feed(fast, 30))
+    assert quality.name == 'high'
+    assert not any(feed(fast, 60))
+    assert quality.tier == 0
+
+
+@pytest.mark.parametrize('tier', [0, 1, 2])
+def test_quality_tiers(baseline, settings, tier):
+    """Play and draw a frame with a 20,000 star background at each tier."""
+    from alien_invasion.alien_invasion import AlienInvasion
+
+    settings.starfield_stars = 20_000
+    ai_game = AlienInvasion(settings)
+    ai_game.difficulty = 'medium'
+    ai_game._start_game()
+    ai_game.quality.tier = tier
+    ai_game._apply_quality()
+
+    def frame():
+        ai_game.engine.update(2)
+        ai_game.starfield.update(2)
+        ai_game._update_screen()
+
+    name = f"frame_{ai_game.quality.name}_quality"
+    run_benchmark(baseline, name, frame, calls=50)
+
+
+@pytest.mark.parametrize('scale_mode', ['nearest', 'smooth'])
+def test_scaled_render(baseline, settings, scale_mode):
+    """Draw a frame at 600x400 and scale it up to a 1800x1200 window."""
+    import pygame
+    from alien_invasion.alien_invasion import AlienInvasion
+
+    settings.scaled_rendering = True
+    settings.screen_width, settings.screen_height = 600, 400
+    settings.window_width, settings.window_height = 1800, 1200
+    settings.scale_mode = scale_mode
+    ai_game = AlienInvasion(settings)
+
+    # Clicks in the window land on the buttons they're drawn over.
+    play_x, play_y = ai_game.game_buttons[0].rect.center
+    ai_game._check_event(pygame.event.Event(
+        pygame.MOUSEBUTTONDOWN, button=1, pos=(play_x * 3, play_y * 3)))
+    assert not ai_game.stats.show_play
+
+    run_benchmark(baseline, f"scaled_render_{scale_mode}",
+                  ai_game._update_screen, calls=50)
+
+
+def test_full_frame_render(baseline, ai_game):
+    """Draw a whole frame of the game."""
+    run_benchmark(baseline, 'full_frame_render', ai_game._update_screen,
+                  calls=100)
+
+
+def test_idle_timers(settings):
+    """Check that the game over timer keeps real time at the idle rate."""
+    from alien_invasion.alien_invasion import AlienInvasion
+    from game_state import GameState
+
+    settings.dirty_rendering = True
+    settings.adaptive_quality = False
+    ai_game = AlienInvasion(settings)
+    ai_game.engine.state.set(GameState.GAME_OVER, 0.5, GameState.MENU)
+
+    # Eight frames at 10 fps take 0.7 s after the first one.
+    ai_game.run_game(max_frames=8)
+    assert ai_game.engine.state.name == GameState.MENU
+
+
+def test_fixed_timestep(settings):
+    """
+    Check the shared game loop runs whole ticks, drops the ones past the
+    catch-up limit, and keeps the part of a tick left over for drawing.
+    """
+    from timestep import FixedTimestep
+
+    timestep = FixedTimestep(settings)
+    dts = []
+
+    # Two and a half ticks run two, and leave half a tick.
+    timestep.lag = timestep.tick_time * 2.5
+    assert timestep.catch_up(dts.append, 5) == (2, 0)
+    assert dts == [timestep.tick_dt] * 2
+    assert timestep.alpha == pytest.approx(0.5)
+
+    # A long stall runs five, drops the rest, and still keeps the half.
+    timestep.lag += timestep.tick_time * 9
+    assert timestep.catch_up(dts.append, 5) == (5, 4)
+    assert timestep.alpha == pytest.approx(0.5)
+    assert (timestep.ticks, timestep.dropped_ticks) == (7, 4)
+
+
+def test_dirty_render(ai_game):
+    """
+    Check that the dirty renderer draws the same frames as a full redraw
+    while lasers fly up through the scoreboard.
+    """
+    import pygame
+    from dirty_renderer import DirtyRenderer
+
+    dirty_renderer = DirtyRenderer(ai_game)
+    sb = ai_game.sb
+    crossed = False
+    for frame in range(200):
+        if frame % 20 == 0:
+            ai_game.engine.fire_laser()
+        ai_game.engine.update(2)
+        dirty_renderer.draw()
+        dirty = pygame.surfarray.array2d(ai_game.screen)
+        ai_game._update_screen()
+        assert (dirty == pygame.surfarray.array2d(ai_game.screen)).all()
+        crossed = crossed or sb.high_score_rect in dirty_renderer.dirty_rects
+    assert crossed
+
+
+def test_dirty_starfield(settings):
+    """Check that the dirty renderer draws the same stars as a full redraw."""
+    import pygame
+    from alien_invasion.alien_invasion import AlienInvasion
+    from dirty_renderer import DirtyRenderer
+
+    settings.starfield_stars = 5000
+    settings.adaptive_quality = False
+    ai_game = AlienInvasion(settings)
+    ai_game.difficulty = 'medium'
+    ai_game._start_game()
+    dirty_renderer = DirtyRenderer(ai_game)
+
+    for frame in range(3):
+        ai_game.engine.update(2)
+        ai_game.starfield.update(20)
+        dirty_renderer.draw()
+        dirty = pygame.surfarray.array2d(ai_game.screen)
+        ai_game._update_screen()
+        assert (dirty == pygame.surfarray.array2d(ai_game.screen)).all()
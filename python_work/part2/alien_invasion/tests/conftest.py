@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Run pygame without opening a window.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# The game's modules import each other by name from the game folder.
+GAME_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'alien_invasion')
+sys.path.insert(0, GAME_DIR)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def game_dir():
+    """Run the tests from the game folder, where the images are."""
+    old_dir = os.getcwd()
+    os.chdir(GAME_DIR)
+    yield GAME_DIR
+    os.chdir(old_dir)